@@ -19,9 +19,37 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
-from backend.core.config import CSV_PATH, MEDICAL_SPECIALTIES_MAP
+from backend.core.config import CSV_PATH
+from backend.core.keywords import SPECIALTY_SCANNER, KeywordScanner, keyword_scanner
 from backend.core.preprocessing import run_preprocessing
 
+# ── Filter vocabularies (list order = priority) ──────────────────────────────
+FACILITY_TYPES = ["hospital", "clinic", "pharmacy", "dentist"]
+REGIONS = [
+    "Greater Accra", "Ashanti", "Western", "Eastern", "Central",
+    "Northern", "Upper East", "Upper West", "Volta", "Bono",
+    "Bono East", "Ahafo", "Savannah", "North East", "Oti",
+]
+CITIES = [
+    "Accra", "Kumasi", "Tamale", "Takoradi", "Cape Coast",
+    "Sunyani", "Bolgatanga", "Wa", "Koforidua", "Tema", "Ho",
+]
+PROCEDURE_KEYWORDS = [
+    "cataract", "surgery", "cesarean", "dialysis", "chemotherapy",
+    "endoscopy", "ultrasound", "x-ray", "mri", "ct scan",
+    "blood transfusion", "dental", "physiotherapy",
+]
+
+# Compiled once at import: one regex pass per vocabulary instead of a
+# substring test (or a fresh per-city word-boundary regex) per keyword.
+_FACILITY_TYPE_SCANNER = keyword_scanner(FACILITY_TYPES)
+_REGION_SCANNER = KeywordScanner((r.lower(), r) for r in REGIONS)
+_CITY_SCANNER = KeywordScanner(((c.lower(), c) for c in CITIES), word_boundary=True)
+_PROCEDURE_SCANNER = keyword_scanner(PROCEDURE_KEYWORDS)
+_NEGATION_RE = re.compile(
+    r"\b(not|without|don.t|doesn.t|don't|doesn't|no\s+\w+|lack|missing|absent)\b"
+)
+
 
 class GenieChatAgent:
     """Text2SQL agent operating on preprocessed facility DataFrame."""
@@ -64,50 +92,17 @@ class GenieChatAgent:
     # ── Extraction ───────────────────────────────────────────────────────────
 
     def _extract_specialty(self, query: str) -> Optional[str]:
-        q = query.lower()
-        for sid, kws in MEDICAL_SPECIALTIES_MAP.items():
-            for kw in kws:
-                if kw in q:
-                    return sid
-        return None
+        return SPECIALTY_SCANNER.first(query.lower())
 
     def _extract_facility_type(self, query: str) -> Optional[str]:
-        q = query.lower()
-        for ft in ["hospital", "clinic", "pharmacy", "dentist"]:
-            if ft in q:
-                return ft
-        return None
+        return _FACILITY_TYPE_SCANNER.first(query.lower())
 
     def _extract_region(self, query: str) -> Optional[str]:
         q = query.lower()
-        regions = [
-            "Greater Accra", "Ashanti", "Western", "Eastern", "Central",
-            "Northern", "Upper East", "Upper West", "Volta", "Bono",
-            "Bono East", "Ahafo", "Savannah", "North East", "Oti",
-        ]
-        cities = [
-            "Accra", "Kumasi", "Tamale", "Takoradi", "Cape Coast",
-            "Sunyani", "Bolgatanga", "Wa", "Koforidua", "Tema", "Ho",
-        ]
-        for r in regions:
-            if r.lower() in q:
-                return r
-        for c in cities:
-            if re.search(r'\b' + re.escape(c.lower()) + r'\b', q):
-                return c
-        return None
+        return _REGION_SCANNER.first(q) or _CITY_SCANNER.first(q)
 
     def _extract_procedure(self, query: str) -> Optional[str]:
-        q = query.lower()
-        kws = [
-            "cataract", "surgery", "cesarean", "dialysis", "chemotherapy",
-            "endoscopy", "ultrasound", "x-ray", "mri", "ct scan",
-            "blood transfusion", "dental", "physiotherapy",
-        ]
-        for kw in kws:
-            if kw in q:
-                return kw
-        return None
+        return _PROCEDURE_SCANNER.first(query.lower())
 
     # ── Query handlers ───────────────────────────────────────────────────────
 
@@ -117,10 +112,7 @@ class GenieChatAgent:
         Catches patterns like 'facilities that do NOT have cardiology',
         'hospitals without MRI', 'clinics that don't offer surgery'.
         """
-        return bool(re.search(
-            r"\b(not|without|don.t|doesn.t|don't|doesn't|no\s+\w+|lack|missing|absent)\b",
-            query.lower(),
-        ))
+        return bool(_NEGATION_RE.search(query.lower()))
 
     def count_with_specialty(self, specialty: str, facility_type: Optional[str] = None,
                              negated: bool = False) -> Dict:
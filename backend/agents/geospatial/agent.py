@@ -32,6 +32,10 @@ from backend.core.preprocessing import run_preprocessing
 
 EARTH_RADIUS_KM = 6371.0
 
+# One WGS84 calculator for the module; geodesic(a, b) would build a fresh
+# Geodesic per call.  Only used for single display distances.
+_GEODESIC = geodesic()
+
 
 class GeospatialAgent:
     """
@@ -88,6 +92,45 @@ class GeospatialAgent:
         else:
             self._ball_tree = None
 
+        self._build_city_index()
+
+    def _build_city_index(self):
+        """Group valid_coords rows by lower-cased city name.
+
+        City names are a small finite set, so a substring lookup scans the
+        distinct names once instead of running ``str.contains`` over every row.
+        """
+        codes, names = pd.factorize(self.valid_coords["address_city"].str.lower())
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        self._city_names: List[str] = list(names)
+        self._city_rows: List[np.ndarray] = [
+            order[bounds[k]:bounds[k + 1]] for k in range(len(names))
+        ]
+        self._city_lat = self.valid_coords["latitude"].to_numpy(dtype=np.float64)
+        self._city_lng = self.valid_coords["longitude"].to_numpy(dtype=np.float64)
+        # Keyed by known city names only, so free-text lookups can't grow it
+        self._city_match_cache: Dict[str, np.ndarray] = {}
+        self._known_cities = frozenset(self._city_names)
+
+    def _match_city_rows(self, city: str) -> np.ndarray:
+        """valid_coords row positions whose city contains *city* (case-insensitive), in row order."""
+        needle = city.lower()
+        rows = self._city_match_cache.get(needle)
+        if rows is None:
+            hits = [r for name, r in zip(self._city_names, self._city_rows) if needle in name]
+            rows = np.sort(np.concatenate(hits)) if hits else np.empty(0, dtype=np.intp)
+            if needle in self._known_cities:
+                self._city_match_cache[needle] = rows
+        return rows
+
+    def city_centroid(self, city: str) -> Tuple[Optional[float], Optional[float]]:
+        """Mean facility coordinates of cities matching *city*, or (None, None)."""
+        rows = self._match_city_rows(city)
+        if len(rows) == 0:
+            return None, None
+        return float(self._city_lat[rows].mean()), float(self._city_lng[rows].mean())
+
     # ═══════════════════════════════════════════════════════════════════════════
     #  BALLTREE HELPERS
     # ═══════════════════════════════════════════════════════════════════════════
@@ -439,34 +482,28 @@ class GeospatialAgent:
                 if city_key in GHANA_CITY_COORDS:
                     return GHANA_CITY_COORDS[city_key]
                 # Fallback: average from facility coordinates
-                match = self.valid_coords[
-                    self.valid_coords["address_city"].str.contains(city, case=False, na=False)
-                ]
-                if not match.empty:
-                    return float(match["latitude"].mean()), float(match["longitude"].mean())
+                lat, lng = self.city_centroid(city)
+                if lat is not None:
+                    return lat, lng
         return None, None
 
     def distance_between_cities(self, city_a: str, city_b: str) -> Dict:
         """Calculate distance between two cities using facility coordinates."""
-        df = self.valid_coords.copy()
-
-        a_match = df[df["address_city"].str.contains(city_a, case=False, na=False)]
-        b_match = df[df["address_city"].str.contains(city_b, case=False, na=False)]
+        a_rows = self._match_city_rows(city_a)
+        b_rows = self._match_city_rows(city_b)
 
-        if a_match.empty or b_match.empty:
+        if len(a_rows) == 0 or len(b_rows) == 0:
             return {
                 "agent": "geospatial",
                 "action": "distance_between_cities",
-                "error": f"Could not find coordinates for {'city A' if a_match.empty else 'city B'}",
+                "error": f"Could not find coordinates for {'city A' if len(a_rows) == 0 else 'city B'}",
             }
 
         # Use mean of facility coords as city center proxy
-        lat_a = a_match["latitude"].mean()
-        lng_a = a_match["longitude"].mean()
-        lat_b = b_match["latitude"].mean()
-        lng_b = b_match["longitude"].mean()
+        lat_a, lng_a = self.city_centroid(city_a)
+        lat_b, lng_b = self.city_centroid(city_b)
 
-        dist = geodesic((lat_a, lng_a), (lat_b, lng_b)).km
+        dist = _GEODESIC.measure((lat_a, lng_a), (lat_b, lng_b))
 
         return {
             "agent": "geospatial",
@@ -474,8 +511,8 @@ class GeospatialAgent:
             "city_a": city_a,
             "city_b": city_b,
             "distance_km": round(dist, 1),
-            "facilities_in_a": len(a_match),
-            "facilities_in_b": len(b_match),
+            "facilities_in_a": len(a_rows),
+            "facilities_in_b": len(b_rows),
         }
 
     # ═══════════════════════════════════════════════════════════════════════════
@@ -30,7 +30,7 @@ except ImportError:
 from backend.core.config import (
     ADVANCED_PROCEDURE_REQUIREMENTS,
     MEDICAL_SPECIALTIES_MAP,
-    RED_FLAG_PATTERNS,
+    RED_FLAG_PATTERNS_COMPILED,
 )
 from backend.core.geocoding import geocode_facility
 from backend.core.preprocessing import run_preprocessing
@@ -399,14 +399,14 @@ class MedicalReasoningAgent:
             full_text = f"{doc} {procs} {caps}".lower()
 
             flags = []
-            for category, patterns in RED_FLAG_PATTERNS.items():
+            for category, patterns in RED_FLAG_PATTERNS_COMPILED.items():
                 for pattern in patterns:
-                    if re.search(pattern, full_text):
-                        match = re.search(pattern, full_text)
+                    match = pattern.search(full_text)
+                    if match:
                         flags.append({
                             "category": category,
-                            "pattern": pattern,
-                            "matched_text": match.group(0) if match else "",
+                            "pattern": pattern.pattern,
+                            "matched_text": match.group(0),
                         })
 
             if flags:
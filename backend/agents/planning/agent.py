@@ -14,18 +14,286 @@ This agent synthesizes outputs from ALL other agents (genie, vector_search,
 medical_reasoning, geospatial) into human-readable action plans.
 """
 
+import math
+import pickle
 import re
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from geopy.distance import geodesic
 
-from backend.core.config import MEDICAL_SPECIALTIES_MAP
+from backend.core import geocoding, preprocessing
+from backend.core.config import CACHE_DIR, CSV_PATH
+from backend.core.keywords import SPECIALTY_SCANNER, keyword_scanner
 from backend.core.preprocessing import run_preprocessing
 
 
+EARTH_RADIUS_KM = 6371.0
+
+# Pickled flat_df, reused across restarts while its sources are unchanged.
+# Bump the version when the flat_df schema changes.
+_FLAT_CACHE = CACHE_DIR / "planning_flat_df.pkl"
+_FLAT_CACHE_VERSION = 1
+_FLAT_CACHE_SOURCES = (CSV_PATH, preprocessing.__file__, geocoding.__file__, __file__)
+
+
+# ── Distance helpers (Mapbox "cheap ruler") ──────────────────────────────────
+# Within a few hundred km (all of Ghana) a latitude-scaled flat-earth
+# approximation on the WGS84 ellipsoid is more accurate than haversine and
+# needs no trig per point pair.
+_WGS84_RE_KM = 6378.137
+_WGS84_E2 = (1 / 298.257223563) * (2 - 1 / 298.257223563)
+
+
+def _cheap_ruler(lat: float) -> Tuple[float, float]:
+    """Return (kx, ky): km per degree of longitude / latitude at *lat*."""
+    m = math.radians(1) * _WGS84_RE_KM
+    coslat = math.cos(math.radians(lat))
+    w2 = 1 / (1 - _WGS84_E2 * (1 - coslat * coslat))
+    w = math.sqrt(w2)
+    return m * w * coslat, m * w * w2 * (1 - _WGS84_E2)
+
+
+def _ruler_km(kx: float, ky: float, lat1, lng1, lat2, lng2):
+    """Cheap-ruler distance in km (degrees in; arrays broadcast)."""
+    return np.hypot(kx * (lng2 - lng1), ky * (lat2 - lat1))
+
+
+def _dist_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Distance in km between two points, ruler taken at their mid-latitude."""
+    kx, ky = _cheap_ruler((lat1 + lat2) / 2)
+    return math.hypot(kx * (lng2 - lng1), ky * (lat2 - lat1))
+
+
+def _two_opt(dist_matrix, tour):
+    """
+    2-opt local search with don't-look bits and first-improvement.
+
+    *tour* lists the node ids with the depot fixed at position 0; it is
+    improved in place and returned.  A node's don't-look bit is set once no
+    improving move starts from it, and cleared again whenever one of its
+    tour edges changes, so converged regions of the tour are not re-scanned
+    on every pass.  A final full scan confirms the result is 2-opt optimal.
+
+    Written for both numba (int32 array tour, 2-D array distances; see
+    :func:`_two_opt_kernel`) and plain Python (lists of ints / of rows),
+    so it only uses row lookups and element-wise swaps.
+    """
+    n = len(tour)
+    dont_look = [False] * n  # indexed by node id
+    improved = True
+    while improved:
+        improved = False
+        skipped = 0
+        for i in range(1, n - 1):
+            a, b = tour[i - 1], tour[i]
+            if dont_look[b]:
+                skipped += 1
+                continue
+            row_a, row_b = dist_matrix[a], dist_matrix[b]
+            d_ab = row_a[b]
+            for j in range(i + 1, n):
+                c, d = tour[j], tour[(j + 1) % n]
+                # Cost delta of reversing segment [i..j]
+                delta = (row_a[c] + row_b[d]) - (d_ab + dist_matrix[c][d])
+                if delta < -1e-9:
+                    lo, hi = i, j
+                    while lo < hi:
+                        tour[lo], tour[hi] = tour[hi], tour[lo]
+                        lo += 1
+                        hi -= 1
+                    dont_look[a] = dont_look[b] = dont_look[c] = dont_look[d] = False
+                    improved = True
+                    break  # first improvement
+            else:
+                dont_look[b] = True
+        if not improved and skipped:
+            # Confirm with one full scan so the result is a true 2-opt optimum
+            for k in range(n):
+                dont_look[k] = False
+            improved = True
+    return tour
+
+
+def _smallest_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` smallest values in ascending order.
+
+    Partial selection (O(N + k log k)) instead of a full argsort.  Every entry
+    tied with the k-th value is kept for the small stable sort, so ties break
+    by index exactly as a full stable sort would.
+    """
+    k = min(k, values.size)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(values, k - 1)[k - 1]
+    candidates = np.flatnonzero(values <= kth)
+    return candidates[np.argsort(values[candidates], kind="stable")[:k]]
+
+
+@lru_cache(maxsize=2048)
+def _detect_specialty(ql: str) -> Optional[str]:
+    """First specialty id whose keywords occur in the lower-cased query."""
+    return SPECIALTY_SCANNER.first(ql)
+
+
+_EQUIPMENT_KEYWORDS = ("ct scanner", "mri", "dialysis", "ultrasound", "x-ray", "ventilator", "oxygen")
+_EQUIPMENT_SCANNER = keyword_scanner(_EQUIPMENT_KEYWORDS)
+
+# Intent routing in one anchored match.  Each branch is a lookahead from the
+# start of the query, so branches are tried in priority order (not leftmost
+# hit) — same outcome as the old sequential re.search cascade.
+_INTENT_PATTERNS = [
+    ("emergency", r"emergenc|route.*patient|nearest.*capable|urgent"),
+    ("specialist", r"specialist.*rotat|deploy.*(?:doctor|specialist|surgeon|cardiolog|dentist|pediatri)"
+                   r"|visiting.*route|rotation.*plan|multi.*stop.*tour"),
+    ("equipment", r"equipment.*distribut|mobile.*unit|place.*scanner|deploy.*equip"),
+    ("facility", r"new.*facilit|build.*hospital|where.*build|optimal.*location"),
+    ("capacity", r"capacity|bed.*need|staff.*need|overload|bottleneck"),
+    ("scenario", r"scenario|plan.*option|what.*can.*plan"),
+]
+_INTENT_RE = re.compile("|".join(
+    rf"(?=(?s:.)*?(?P<{name}>{pat}))" for name, pat in _INTENT_PATTERNS
+))
+
+
+# ── Lazily-imported heavy dependencies ───────────────────────────────────────
+# sklearn / scipy are only needed by individual scenarios; keep them off the
+# import path.
+_balltree_cls = None
+
+
+def _balltree():
+    global _balltree_cls
+    if _balltree_cls is None:
+        from sklearn.neighbors import BallTree
+        _balltree_cls = BallTree
+    return _balltree_cls
+
+
+_ckdtree_cls = None
+
+
+def _ckdtree():
+    global _ckdtree_cls
+    if _ckdtree_cls is None:
+        from scipy.spatial import cKDTree
+        _ckdtree_cls = cKDTree
+    return _ckdtree_cls
+
+
+# Below this many facilities a parallel linear scan beats building a BallTree
+_MAXIMIN_SCAN_MAX_FACILITIES = 2000
+_maximin_scan_jit = None
+_ruler_gather_jit = None
+_two_opt_jit = None
+_njit = None
+_prange = range  # rebound to numba.prange when the JIT kernels are built
+# Held around every numba-parallel kernel call: numba's workqueue threading
+# layer (the only one without TBB/OpenMP) aborts the process when parallel
+# regions are launched from several Python threads at once
+_parallel_kernel_lock = threading.Lock()
+
+
+def _maximin_scan(grid_lat, grid_lng, fac_lat, fac_lng):
+    """
+    For every grid point (radians) return the haversine distance in km to
+    the nearest facility and that facility's position.  Compares the
+    haversine ``a`` term (monotonic in distance) and only takes asin/sqrt
+    once per grid point.  Compiled with numba by :func:`_maximin_kernel`.
+    """
+    n_grid = grid_lat.shape[0]
+    dist = np.empty(n_grid)
+    nearest = np.empty(n_grid, dtype=np.int64)
+    for g in _prange(n_grid):
+        cos_g = math.cos(grid_lat[g])
+        best = 2.0
+        best_f = 0
+        for f in range(fac_lat.shape[0]):
+            a = (
+                math.sin((fac_lat[f] - grid_lat[g]) * 0.5) ** 2
+                + cos_g * math.cos(fac_lat[f]) * math.sin((fac_lng[f] - grid_lng[g]) * 0.5) ** 2
+            )
+            if a < best:
+                best = a
+                best_f = f
+        dist[g] = 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(best))
+        nearest[g] = best_f
+    return dist, nearest
+
+
+def _ruler_gather(kx, ky, lat0, lng0, lat, lng, rows):
+    """
+    Cheap-ruler distance in km from (lat0, lng0) to the facilities at *rows*
+    of the degree arrays *lat*/*lng*.  Gather and distance are fused into one
+    loop, so no intermediate coordinate/delta arrays are materialised.
+    Compiled with numba by :func:`_ruler_kernel`.
+    """
+    out = np.empty(rows.shape[0])
+    for i in range(rows.shape[0]):
+        r = rows[i]
+        out[i] = math.hypot(kx * (lng[r] - lng0), ky * (lat[r] - lat0))
+    return out
+
+
+def _numba_njit():
+    """Import numba on first use; return ``njit``, or None without numba."""
+    global _njit, _prange
+    if _njit is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _njit = False
+        else:
+            _prange = prange
+            _njit = njit
+    return _njit or None
+
+
+def _maximin_kernel():
+    """Return the numba-parallel :func:`_maximin_scan`, or None without numba.
+
+    Call it while holding ``_parallel_kernel_lock``.
+    """
+    global _maximin_scan_jit
+    if _maximin_scan_jit is None:
+        njit = _numba_njit()
+        _maximin_scan_jit = (
+            njit(parallel=True, fastmath=True, cache=True)(_maximin_scan) if njit else False
+        )
+    return _maximin_scan_jit or None
+
+
+def _ruler_kernel():
+    """Return the numba-compiled :func:`_ruler_gather`, or None without numba.
+
+    Serial: a routing query gathers a handful of rows, too few for a
+    parallel launch to pay off.  No fastmath here: routing rounds distances
+    to 0.1 km and ranks ties by row order, so results must match the NumPy
+    path bit for bit.
+    """
+    global _ruler_gather_jit
+    if _ruler_gather_jit is None:
+        njit = _numba_njit()
+        _ruler_gather_jit = njit(cache=True)(_ruler_gather) if njit else False
+    return _ruler_gather_jit or None
+
+
+def _two_opt_kernel():
+    """Return the numba-compiled :func:`_two_opt`, or None without numba.
+
+    Serial, like the routing gather: a rotation has a few dozen stops.
+    """
+    global _two_opt_jit
+    if _two_opt_jit is None:
+        njit = _numba_njit()
+        _two_opt_jit = njit(cache=True)(_two_opt) if njit else False
+    return _two_opt_jit or None
+
+
 # ── Planning scenario templates ──────────────────────────────────────────────
 
 SCENARIOS = {
@@ -63,50 +331,220 @@ class PlanningAgent:
     deployment plans accessible to all experience levels.
     """
 
+    # Tables/indexes built from the default (preprocessed CSV) source, shared
+    # by every PlanningAgent() so the API and the workflow don't each build
+    # their own copy.  Agents given an explicit DataFrame keep private state.
+    _shared_state: ClassVar[Optional[Dict[str, Any]]] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, df: Optional[pd.DataFrame] = None):
+        if df is not None:
+            self._load(df)
+            return
+        with PlanningAgent._shared_lock:
+            if PlanningAgent._shared_state is None:
+                self._load(None)
+                PlanningAgent._shared_state = dict(self.__dict__)
+            else:
+                self.__dict__.update(PlanningAgent._shared_state)
+
+    def _load(self, df: Optional[pd.DataFrame]):
+        """Build flat_df and its derived arrays (from *df* or the default source)."""
+        columns = None
         if df is not None:
             self._source_df = df
         else:
-            self._source_df = run_preprocessing()
-        self._build_flat_df()
-
-    def _build_flat_df(self):
-        rows = []
-        for i, m in enumerate(self._source_df["metadata"].tolist()):
-            lat = m.get("latitude")
-            lng = m.get("longitude")
-            try:
-                lat = float(lat) if lat else None
-                lng = float(lng) if lng else None
-            except (ValueError, TypeError):
-                lat, lng = None, None
-            cap = m.get("capacity")
-            docs = m.get("numberDoctors")
-            try:
-                cap = float(cap) if cap else None
-            except (ValueError, TypeError):
-                cap = None
+            # Preprocessed columns restored from disk skip the CSV pass entirely
+            columns = self._load_flat_cache()
+            self._source_df = None if columns is not None else run_preprocessing()
+        if columns is None:
+            columns = self._flat_columns()
+            if df is None:
+                self._save_flat_cache(columns)
+        self.flat_df = pd.DataFrame(columns, copy=False)
+        self._index_flat_df()
+
+    # ── On-disk cache of the flat table ──────────────────────────────────────
+
+    @staticmethod
+    def _flat_cache_key() -> Tuple:
+        """Invalidate on any change to the CSV or the code that shapes flat_df."""
+        key: List[Any] = [_FLAT_CACHE_VERSION]
+        for path in _FLAT_CACHE_SOURCES:
             try:
-                docs = float(docs) if docs else None
-            except (ValueError, TypeError):
-                docs = None
-
-            rows.append({
-                "name": m.get("name", "Unknown"),
-                "organization_type": m.get("organization_type"),
-                "facilityTypeId": m.get("facilityTypeId"),
-                "address_city": m.get("address_city"),
-                "address_stateOrRegion": m.get("address_stateOrRegion"),
-                "latitude": lat,
-                "longitude": lng,
-                "specialties": m.get("specialties", []),
-                "procedure": m.get("procedure", []),
-                "equipment": m.get("equipment", []),
-                "capability": m.get("capability", []),
-                "capacity": cap,
-                "numberDoctors": docs,
-            })
-        self.flat_df = pd.DataFrame(rows)
+                st = Path(path).stat()
+            except OSError:
+                return ()
+            key.append((st.st_mtime_ns, st.st_size))
+        return tuple(key)
+
+    def _load_flat_cache(self) -> Optional[Dict[str, Any]]:
+        key = self._flat_cache_key()
+        if not key or not _FLAT_CACHE.exists():
+            return None
+        try:
+            with open(_FLAT_CACHE, "rb") as f:
+                cached = pickle.load(f)
+        except Exception:
+            return None
+        if cached.get("key") != key:
+            return None
+        return cached["columns"]
+
+    def _save_flat_cache(self, columns: Dict[str, Any]):
+        # Raw columns rather than the DataFrame: rebuilding through the same
+        # constructor keeps dtype inference (and missing values) identical.
+        key = self._flat_cache_key()
+        if not key:
+            return
+        try:
+            _FLAT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _FLAT_CACHE.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump({"key": key, "columns": columns}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(_FLAT_CACHE)
+        except OSError:
+            pass  # cache is best-effort (e.g. read-only deployment)
+
+    def _flat_columns(self) -> Dict[str, Any]:
+        """Build the flat facility table column-by-column (one pass, typed columns)."""
+        metadata = self._source_df["metadata"].tolist()
+        n = len(metadata)
+
+        names = np.empty(n, dtype=object)
+        org_types = np.empty(n, dtype=object)
+        facility_types = np.empty(n, dtype=object)
+        cities = np.empty(n, dtype=object)
+        regions = np.empty(n, dtype=object)
+        raw_lat = np.empty(n, dtype=object)
+        raw_lng = np.empty(n, dtype=object)
+        raw_cap = np.empty(n, dtype=object)
+        raw_docs = np.empty(n, dtype=object)
+        specialties: List[List[str]] = [None] * n
+        procedures: List[List[str]] = [None] * n
+        equipment: List[List[str]] = [None] * n
+        capability: List[List[str]] = [None] * n
+
+        for i, m in enumerate(metadata):
+            names[i] = m.get("name", "Unknown")
+            org_types[i] = m.get("organization_type")
+            facility_types[i] = m.get("facilityTypeId")
+            cities[i] = m.get("address_city")
+            regions[i] = m.get("address_stateOrRegion")
+            raw_lat[i] = m.get("latitude") or None
+            raw_lng[i] = m.get("longitude") or None
+            raw_cap[i] = m.get("capacity") or None
+            raw_docs[i] = m.get("numberDoctors") or None
+            specialties[i] = m.get("specialties", [])
+            procedures[i] = m.get("procedure", [])
+            equipment[i] = m.get("equipment", [])
+            capability[i] = m.get("capability", [])
+
+        # Single vectorised coercion instead of per-row try/float/except
+        lat_arr = pd.to_numeric(raw_lat, errors="coerce").astype(np.float64)
+        lng_arr = pd.to_numeric(raw_lng, errors="coerce").astype(np.float64)
+        # A facility is only geo-located if *both* coordinates parse
+        bad_coords = np.isnan(lat_arr) | np.isnan(lng_arr)
+        lat_arr[bad_coords] = np.nan
+        lng_arr[bad_coords] = np.nan
+        cap_arr = pd.to_numeric(raw_cap, errors="coerce").astype(np.float64)
+        docs_arr = pd.to_numeric(raw_docs, errors="coerce").astype(np.float64)
+
+        return {
+            "name": names,
+            "organization_type": org_types,
+            "facilityTypeId": facility_types,
+            "address_city": cities,
+            "address_stateOrRegion": regions,
+            "latitude": lat_arr,
+            "longitude": lng_arr,
+            "specialties": specialties,
+            "procedure": procedures,
+            "equipment": equipment,
+            "capability": capability,
+            "capacity": cap_arr,
+            "numberDoctors": docs_arr,
+            # Lower-cased equipment list, joined once for substring lookups
+            "equipment_blob": [" | ".join(e or ()).lower() for e in equipment],
+            "capability_blob": [" | ".join(c or ()).lower() for c in capability],
+        }
+
+    def _index_flat_df(self):
+        """Derive the arrays and indexes the scenario hot paths use from flat_df."""
+        lat_arr = self.flat_df["latitude"].to_numpy(dtype=np.float64)
+        lng_arr = self.flat_df["longitude"].to_numpy(dtype=np.float64)
+        cap_arr = self.flat_df["capacity"].to_numpy(dtype=np.float64)
+        docs_arr = self.flat_df["numberDoctors"].to_numpy(dtype=np.float64)
+
+        # Structure-of-arrays view used by the scenario hot paths
+        self._has_coords = ~np.isnan(lat_arr)
+        self._lat = lat_arr
+        self._lng = lng_arr
+        self._lat_rad = np.radians(lat_arr)
+        self._lng_rad = np.radians(lng_arr)
+        self._capacity = cap_arr
+        self._num_doctors = docs_arr
+        # Sorted region codes (-1 = no region) for capacity aggregation
+        self._region_codes, self._region_names = pd.factorize(
+            self.flat_df["address_stateOrRegion"], sort=True
+        )
+        # Object views of the columns emitted per facility in routing results
+        self._display_cols = {
+            c: self.flat_df[c].to_numpy(dtype=object)
+            for c in ("name", "address_city", "address_stateOrRegion", "specialties", "equipment")
+        }
+
+        self._build_specialty_index()
+        self._equip_mask_cache: Dict[str, np.ndarray] = {}
+
+        # Query-independent part of the capability score (see _capability_scores)
+        self._has_icu = self.flat_df["capability_blob"].str.contains(
+            "icu|operating theater|operating theatre", regex=True, na=False
+        ).to_numpy(dtype=bool)
+        self._has_imaging = self.flat_df["equipment_blob"].str.contains(
+            "ct|mri|scanner", regex=True, na=False
+        ).to_numpy(dtype=bool)
+        self._capability_base = (
+            20
+            + 20 * self._has_icu.astype(np.int64)
+            + 10 * (cap_arr > 20)
+            + 10 * (docs_arr > 0)
+            + 5 * self._has_imaging
+        )
+
+    def _build_specialty_index(self):
+        """Build specialty -> boolean row mask over flat_df in one pass."""
+        n = len(self.flat_df)
+        self._spec_mask: Dict[str, np.ndarray] = {}
+        for i, specs in enumerate(self.flat_df["specialties"]):
+            for s in specs or ():
+                mask = self._spec_mask.get(s)
+                if mask is None:
+                    mask = self._spec_mask[s] = np.zeros(n, dtype=bool)
+                mask[i] = True
+        self._no_spec_mask = np.zeros(n, dtype=bool)
+
+    def _specialty_mask(self, specialty: str) -> np.ndarray:
+        """Read-only mask of facilities offering *specialty* (all False if none)."""
+        return self._spec_mask.get(specialty, self._no_spec_mask)
+
+    def _equipment_mask(self, equipment_type: str) -> np.ndarray:
+        """Boolean mask over flat_df of facilities listing *equipment_type*.
+
+        Case-insensitive substring match.  Masks for the known equipment
+        keywords are computed once and cached; other strings (callers may
+        pass free text) are matched afresh so the cache stays bounded.
+        """
+        key = equipment_type.lower()
+        mask = self._equip_mask_cache.get(key)
+        if mask is None:
+            mask = self.flat_df["equipment_blob"].str.contains(
+                key, regex=False, na=False
+            ).to_numpy(dtype=bool)
+            if key in _EQUIPMENT_KEYWORDS:
+                self._equip_mask_cache[key] = mask
+        return mask
 
     # ═══════════════════════════════════════════════════════════════════════════
     #  1. EMERGENCY ROUTING
@@ -116,41 +554,51 @@ class PlanningAgent:
                           origin_lat: Optional[float] = None,
                           origin_lng: Optional[float] = None) -> Dict:
         """Find nearest capable facility and generate route plan."""
-        df = self.flat_df.dropna(subset=["latitude", "longitude"]).copy()
-
+        mask = self._has_coords
         if specialty:
-            df = df[df["specialties"].apply(lambda s: isinstance(s, list) and specialty in s)]
+            mask = mask & self._specialty_mask(specialty)
+        rows = np.flatnonzero(mask)
 
-        if df.empty:
+        if rows.size == 0:
             return {"error": f"No facilities found for specialty '{specialty}'"}
 
         # Default origin: geographic center of Ghana
         if origin_lat is None:
             origin_lat, origin_lng = 7.9465, -1.0232
 
-        # Calculate distances
-        distances = []
-        for _, row in df.iterrows():
-            dist = geodesic(
-                (origin_lat, origin_lng),
-                (row["latitude"], row["longitude"])
-            ).km
-            travel_min = round(dist / 60 * 60, 0)  # ~60km/h average
-            distances.append({
-                "facility": row["name"],
-                "city": row["address_city"],
-                "region": row["address_stateOrRegion"],
-                "distance_km": round(dist, 1),
-                "est_travel_min": int(travel_min),
-                "latitude": row["latitude"],
-                "longitude": row["longitude"],
-                "specialties": row["specialties"],
-                "equipment": row["equipment"][:5],
-                "capacity": row["capacity"],
-                "capability_match": self._capability_score(row, specialty),
-            })
-
-        distances.sort(key=lambda x: x["distance_km"])
+        # Cheap-ruler distance over the precomputed coordinate columns (fused
+        # numba gather+distance kernel when available, NumPy otherwise)
+        kx, ky = _cheap_ruler(origin_lat)
+        kernel = _ruler_kernel()
+        if kernel is not None:
+            dists = kernel(kx, ky, float(origin_lat), float(origin_lng), self._lat, self._lng, rows)
+        else:
+            dists = _ruler_km(kx, ky, origin_lat, origin_lng, self._lat[rows], self._lng[rows])
+        dist_km = np.round(dists, 1)
+
+        # Only the 5 nearest are ever emitted (primary, backup, 3 alternatives)
+        top = _smallest_k(dist_km, 5)
+
+        # Records are built for the winners only, straight from the arrays
+        top_rows = rows[top]
+        scores = self._capability_scores(top_rows, specialty)
+        text = self._display_cols
+        distances = [
+            {
+                "facility": text["name"][r],
+                "city": text["address_city"][r],
+                "region": text["address_stateOrRegion"][r],
+                "distance_km": float(dist_km[t]),
+                "est_travel_min": int(np.rint(dists[t])),  # ~60km/h average
+                "latitude": float(self._lat[r]),
+                "longitude": float(self._lng[r]),
+                "specialties": text["specialties"][r],
+                "equipment": text["equipment"][r][:5],
+                "capacity": float(self._capacity[r]),
+                "capability_match": int(score),
+            }
+            for t, r, score in zip(top, top_rows, scores)
+        ]
         nearest = distances[0]
         backup = distances[1] if len(distances) > 1 else None
 
@@ -167,7 +615,7 @@ class PlanningAgent:
                 f"2. Estimated travel time: {nearest['est_travel_min']} minutes",
                 f"3. Capability match: {nearest['capability_match']}%",
             ],
-            "total_options": len(distances),
+            "total_options": int(rows.size),
         }
 
         if backup:
@@ -177,8 +625,8 @@ class PlanningAgent:
 
         return plan
 
-    def _capability_score(self, row: pd.Series, specialty: Optional[str]) -> int:
-        """Score 0-100 how well-equipped a facility is for this need.
+    def _capability_scores(self, rows: np.ndarray, specialty: Optional[str]) -> np.ndarray:
+        """Score 0-100 how well-equipped each facility at *rows* is for this need.
 
         Weighting rationale (for emergency routing the *clinical match*
         matters most — a facility with the right specialty but limited
@@ -190,23 +638,15 @@ class PlanningAgent:
           Capacity > 20:     +10  (can actually admit the patient)
           Has doctors:       +10  (staffing reality-check)
           Advanced imaging:  +5   (nice to have, not decisive)
+
+        The specialty-independent terms are precomputed per facility in
+        _index_flat_df (base score 20); only the specialty bonus is per query.
         """
-        score = 20  # base
+        score = self._capability_base[rows]
         # Primary: does the facility actually cover the needed specialty?
-        if specialty and specialty in row.get("specialties", []):
-            score += 35
-        # Infrastructure
-        equip = " ".join(row.get("equipment", [])).lower()
-        cap = " ".join(row.get("capability", [])).lower()
-        if "icu" in cap or "operating theater" in cap or "operating theatre" in cap:
-            score += 20
-        if row.get("capacity") and row["capacity"] > 20:
-            score += 10
-        if row.get("numberDoctors") and row["numberDoctors"] > 0:
-            score += 10
-        if "ct" in equip or "mri" in equip or "scanner" in equip:
-            score += 5
-        return min(100, score)
+        if specialty:
+            score = score + 35 * self._specialty_mask(specialty)[rows]
+        return np.minimum(score, 100)
 
     # ═══════════════════════════════════════════════════════════════════════════
     #  2. SPECIALIST DEPLOYMENT PLAN  (Greedy NN + 2-opt)
@@ -224,48 +664,42 @@ class PlanningAgent:
         a side-by-side comparison.  The classical result is always present;
         the quantum result is additive and never blocks the response.
         """
-        df = self.flat_df.copy()
-
-        # Find facilities that NEED this specialty (don't have it)
+        # Find facilities that NEED this specialty (don't have it), with coords
+        mask = self._has_coords
         if specialty:
-            needs = df[~df["specialties"].apply(lambda s: isinstance(s, list) and specialty in s)]
-            has = df[df["specialties"].apply(lambda s: isinstance(s, list) and specialty in s)]
-        else:
-            needs = df
-            has = pd.DataFrame()
-
-        # Filter to those with coords
-        needs = needs.dropna(subset=["latitude", "longitude"])
+            mask = mask & ~self._specialty_mask(specialty)
+        rows = np.flatnonzero(mask)
+        needs = self.flat_df.iloc[rows]
 
         if needs.empty:
             return {"error": "No underserved facilities found"}
 
         # ── Stage 1: Greedy nearest-neighbour to get initial tour ──
-        stop_indices = []
-        visited = set()
-        current_lat, current_lng = 5.6037, -0.1870  # Start from Accra
-        n_stops = min(max_facilities, len(needs))
-
-        for _ in range(n_stops):
-            best_dist = float("inf")
-            best_idx = None
-            for idx, row in needs.iterrows():
-                if idx in visited:
-                    continue
-                d = geodesic(
-                    (current_lat, current_lng),
-                    (row["latitude"], row["longitude"])
-                ).km
-                if d < best_dist:
-                    best_dist = d
-                    best_idx = idx
-            if best_idx is None:
-                break
-            visited.add(best_idx)
-            stop_indices.append(best_idx)
-            row = needs.loc[best_idx]
-            current_lat = row["latitude"]
-            current_lng = row["longitude"]
+        # Cheap-ruler projection (km) is exact enough at Ghana scale to rank
+        # neighbours, and lets a KD-tree answer each step in O(log N).
+        depot_lat, depot_lng = 5.6037, -0.1870  # Start from Accra
+        kx, ky = _cheap_ruler(float(self._lat[rows].mean()))
+        xy = np.column_stack([kx * self._lng[rows], ky * self._lat[rows]])
+        tree = _ckdtree()(xy)
+
+        stop_positions: List[int] = []
+        visited = np.zeros(len(rows), dtype=bool)
+        current = (kx * depot_lng, ky * depot_lat)
+        n_stops = min(max_facilities, len(rows))
+
+        for step in range(n_stops):
+            # The nearest unvisited point is among the (visited + 1) nearest
+            dist, idx = tree.query(current, k=step + 1)
+            dist, idx = np.atleast_1d(dist), np.atleast_1d(idx)
+            best_dist = dist[~visited[idx]].min()
+            # Break distance ties by row order (coincident geocoded facilities)
+            tied = tree.query_ball_point(current, r=best_dist * (1 + 1e-9) + 1e-9)
+            best = min(i for i in tied if not visited[i])
+            visited[best] = True
+            stop_positions.append(best)
+            current = tuple(xy[best])
+
+        stop_indices = needs.index[stop_positions].tolist()
 
         if len(stop_indices) < 2:
             # Not enough stops for 2-opt, just build result
@@ -279,35 +713,17 @@ class PlanningAgent:
             coords.append((row["latitude"], row["longitude"]))
 
         n = len(coords)
-        dist_matrix = np.zeros((n, n))
-        for i in range(n):
-            for j in range(i + 1, n):
-                d = geodesic(coords[i], coords[j]).km
-                dist_matrix[i, j] = d
-                dist_matrix[j, i] = d
-
-        # Initial tour: 0 → 1 → 2 → ... → n-1 (greedy NN order)
-        tour = list(range(n))
-
-        # 2-opt local search
-        improved = True
-        while improved:
-            improved = False
-            for i in range(1, n - 1):
-                for j in range(i + 1, n):
-                    # Cost of current edges
-                    old_cost = (
-                        dist_matrix[tour[i - 1], tour[i]]
-                        + dist_matrix[tour[j], tour[(j + 1) % n]]
-                    )
-                    # Cost after reversing segment [i..j]
-                    new_cost = (
-                        dist_matrix[tour[i - 1], tour[j]]
-                        + dist_matrix[tour[i], tour[(j + 1) % n]]
-                    )
-                    if new_cost < old_cost - 1e-9:
-                        tour[i : j + 1] = reversed(tour[i : j + 1])
-                        improved = True
+        lat, lng = np.asarray(coords, dtype=np.float64).T
+        kx, ky = _cheap_ruler(float(lat.mean()))
+        dist_matrix = _ruler_km(kx, ky, lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+
+        # Initial tour: 0 → 1 → 2 → ... → n-1 (greedy NN order), then 2-opt
+        # (numba kernel when available, else the same loop on Python lists)
+        kernel = _two_opt_kernel()
+        if kernel is not None:
+            tour = kernel(dist_matrix, np.arange(n, dtype=np.int32)).tolist()
+        else:
+            tour = _two_opt(dist_matrix.tolist(), list(range(n)))
 
         # Rebuild stop order from optimised tour (skip depot node 0)
         optimised_indices = [stop_indices[tour[t] - 1] for t in range(1, n)]
@@ -332,10 +748,7 @@ class PlanningAgent:
 
         for idx in ordered_indices:
             row = needs.loc[idx]
-            dist = geodesic(
-                (current_lat, current_lng),
-                (row["latitude"], row["longitude"])
-            ).km
+            dist = _dist_km(current_lat, current_lng, row["latitude"], row["longitude"])
             total_distance += dist
             stops.append({
                 "stop": len(stops) + 1,
@@ -448,47 +861,42 @@ class PlanningAgent:
 
     def equipment_distribution(self, equipment_type: str = "CT scanner") -> Dict:
         """Plan where to deploy mobile/new equipment to maximize coverage."""
-        df = self.flat_df.dropna(subset=["latitude", "longitude"]).copy()
-
-        # Find who already has it
-        equip_lower = equipment_type.lower()
-        df["has_equipment"] = df["equipment"].apply(
-            lambda e: any(equip_lower in x.lower() for x in e)
+        # Find who already has it (geo-located facilities only; no frame copy)
+        has_equipment = self._equipment_mask(equipment_type)
+        with_equip = self.flat_df[self._has_coords & has_equipment]
+        without_equip = self.flat_df[self._has_coords & ~has_equipment]
+
+        # Score regions by need: one groupby instead of iterrows + per-region
+        # re-filtering.  Groups keep first-appearance order so the stable sort
+        # ranks equal counts the same way as before.
+        by_region = without_equip.groupby("address_stateOrRegion", sort=False, dropna=False)
+        ranked_regions = by_region.size().sort_values(ascending=False, kind="stable")
+        nearby = (
+            by_region.head(3)
+            .groupby("address_stateOrRegion", sort=False, dropna=False)["name"]
+            .agg(list)
+        )
+        # Highest-capacity facility per region (first listed wins ties / all-NaN)
+        best_by_region = (
+            without_equip.sort_values("capacity", ascending=False, kind="stable")
+            .drop_duplicates("address_stateOrRegion")
+            .set_index("address_stateOrRegion")
         )
-        with_equip = df[df["has_equipment"]]
-        without_equip = df[~df["has_equipment"]]
-
-        # Score regions by need
-        region_need = {}
-        for _, row in without_equip.iterrows():
-            region = row.get("address_stateOrRegion", "Unknown")
-            region_need.setdefault(region, {"count": 0, "facilities": []})
-            region_need[region]["count"] += 1
-            if len(region_need[region]["facilities"]) < 3:
-                region_need[region]["facilities"].append(row["name"])
-
-        # Sort by need
-        ranked_regions = sorted(region_need.items(), key=lambda x: x[1]["count"], reverse=True)
 
         # Suggest placements
         placements = []
-        for region, data in ranked_regions[:5]:
-            region_facs = without_equip[without_equip["address_stateOrRegion"] == region]
-            if region_facs.empty:
-                continue
-            # Pick facility with highest capacity as placement
-            if "capacity" in region_facs.columns:
-                best = region_facs.sort_values("capacity", ascending=False).iloc[0]
-            else:
-                best = region_facs.iloc[0]
+        for region, count in ranked_regions.head(5).items():
+            if pd.isna(region):
+                continue  # facilities without a region can't anchor a placement
+            best = best_by_region.loc[region]
             placements.append({
                 "region": region,
                 "recommended_facility": best["name"],
                 "city": best["address_city"],
                 "latitude": best["latitude"],
                 "longitude": best["longitude"],
-                "facilities_served": data["count"],
-                "nearby_facilities": data["facilities"][:3],
+                "facilities_served": int(count),
+                "nearby_facilities": nearby[region],
             })
 
         return {
@@ -518,34 +926,24 @@ class PlanningAgent:
         This is the opposite of the old centroid approach, which incorrectly
         placed new facilities where facilities already cluster.
         """
-        from sklearn.neighbors import BallTree
-
-        EARTH_RADIUS_KM = 6371.0
-
-        df = self.flat_df.dropna(subset=["latitude", "longitude"]).copy()
-
+        coord_rows = np.flatnonzero(self._has_coords)
         if specialty:
-            df_spec = df[df["specialties"].apply(lambda s: isinstance(s, list) and specialty in s)]
+            spec_rows = np.flatnonzero(self._has_coords & self._specialty_mask(specialty))
         else:
-            df_spec = df
+            spec_rows = coord_rows
 
         # Region-level analysis
-        if len(df_spec) > 0 and "address_stateOrRegion" in df_spec.columns:
-            region_counts = df_spec["address_stateOrRegion"].fillna("Unknown").value_counts()
-        else:
-            region_counts = pd.Series(dtype=int)
-        total_by_region = df["address_stateOrRegion"].fillna("Unknown").value_counts()
+        regions = self.flat_df["address_stateOrRegion"]
+        region_counts = regions.iloc[spec_rows].fillna("Unknown").value_counts()
+        total_by_region = regions.iloc[coord_rows].fillna("Unknown").value_counts()
 
-        # ── Maximin placement using BallTree ──
-        existing_coords = df_spec[["latitude", "longitude"]].values
-        if len(existing_coords) == 0:
-            existing_coords = df[["latitude", "longitude"]].values
+        # ── Maximin placement: distance from grid to existing facilities ──
+        site_rows = spec_rows if spec_rows.size else coord_rows
 
-        if len(existing_coords) == 0:
+        if site_rows.size == 0:
             return {"error": "No facilities with coordinates found"}
 
-        existing_rad = np.deg2rad(existing_coords)
-        tree = BallTree(existing_rad, metric="haversine")
+        site_lat, site_lng = self._lat_rad[site_rows], self._lng_rad[site_rows]
 
         # Build grid over Ghana
         from backend.core.config import GHANA_BOUNDING_BOX
@@ -558,12 +956,27 @@ class PlanningAgent:
         grid_points = np.column_stack([glat.ravel(), glng.ravel()])
         grid_rad = np.deg2rad(grid_points)
 
-        # For each grid point, find distance to nearest existing facility
-        dist_rad, _ = tree.query(grid_rad, k=1)
-        dist_km = dist_rad[:, 0] * EARTH_RADIUS_KM
+        # For each grid point, find distance to (and position of) the nearest
+        # existing facility: parallel linear scan for typical catalogue sizes,
+        # BallTree for very large ones or when numba is unavailable.
+        kernel = (
+            _maximin_kernel()
+            if site_rows.size < _MAXIMIN_SCAN_MAX_FACILITIES
+            else None
+        )
+        if kernel is not None:
+            grid_lat_rad = np.ascontiguousarray(grid_rad[:, 0])
+            grid_lng_rad = np.ascontiguousarray(grid_rad[:, 1])
+            with _parallel_kernel_lock:
+                dist_km, nearest = kernel(grid_lat_rad, grid_lng_rad, site_lat, site_lng)
+        else:
+            tree = _balltree()(np.column_stack([site_lat, site_lng]), metric="haversine")
+            dist_rad, near = tree.query(grid_rad, k=1)
+            dist_km = dist_rad[:, 0] * EARTH_RADIUS_KM
+            nearest = near[:, 0]
 
         # Rank grid points by distance (farthest from any facility = best placement)
-        ranking = np.argsort(-dist_km)
+        ranking = _smallest_k(-dist_km, 10)
 
         suggestions = []
         for rank in range(min(10, len(ranking))):
@@ -573,9 +986,7 @@ class PlanningAgent:
             gap_km = float(dist_km[idx])
 
             # Find which region this point falls in (approximate via nearest facility)
-            near_idx = tree.query(np.deg2rad([[pt_lat, pt_lng]]), k=1)[1][0, 0]
-            near_row_idx = df_spec.index[near_idx] if near_idx < len(df_spec) else df.index[near_idx]
-            region = df.loc[near_row_idx, "address_stateOrRegion"] if near_row_idx in df.index else "Unknown"
+            region = regions.iat[site_rows[nearest[idx]]]
             spec_count = int(region_counts.get(region, 0))
 
             suggestions.append({
@@ -610,44 +1021,54 @@ class PlanningAgent:
 
     def capacity_planning(self) -> Dict:
         """Analyse bed/doctor capacity by region and identify bottlenecks."""
-        df = self.flat_df.copy()
-
-        regions = []
-        for region, grp in df.groupby("address_stateOrRegion"):
-            if pd.isna(region):
-                continue
-            total = len(grp)
-            beds = grp["capacity"].sum() if "capacity" in grp else 0
-            docs = grp["numberDoctors"].sum() if "numberDoctors" in grp else 0
-            beds = 0 if pd.isna(beds) else beds
-            docs = 0 if pd.isna(docs) else docs
-
-            bed_ratio = round(beds / total, 1) if total > 0 else 0
-            doc_ratio = round(docs / total, 2) if total > 0 else 0
-
-            regions.append({
-                "region": region,
-                "facilities": total,
-                "total_beds": int(beds),
-                "total_doctors": int(docs),
-                "beds_per_facility": bed_ratio,
-                "doctors_per_facility": doc_ratio,
-                "status": "critical" if bed_ratio < 5 and total > 3 else (
-                    "warning" if bed_ratio < 15 else "adequate"
+        # Per-region sums over the pre-factorised region codes; missing beds /
+        # doctors count as 0 and facilities without a region are left out.
+        codes = self._region_codes
+        has_region = codes >= 0
+        codes = codes[has_region]
+        n_regions = len(self._region_names)
+        agg = pd.DataFrame(
+            {
+                "facilities": np.bincount(codes, minlength=n_regions),
+                "total_beds": np.bincount(
+                    codes, weights=np.nan_to_num(self._capacity[has_region]), minlength=n_regions
                 ),
-            })
-
-        regions.sort(key=lambda x: x["beds_per_facility"])
+                "total_doctors": np.bincount(
+                    codes, weights=np.nan_to_num(self._num_doctors[has_region]), minlength=n_regions
+                ),
+            },
+            index=self._region_names,
+        )
+        agg["beds_per_facility"] = (agg["total_beds"] / agg["facilities"]).round(1)
+        agg["doctors_per_facility"] = (agg["total_doctors"] / agg["facilities"]).round(2)
+        agg["total_beds"] = agg["total_beds"].astype(np.int64)
+        agg["total_doctors"] = agg["total_doctors"].astype(np.int64)
+        agg["status"] = np.select(
+            [
+                (agg["beds_per_facility"] < 5) & (agg["facilities"] > 3),
+                agg["beds_per_facility"] < 15,
+            ],
+            ["critical", "warning"],
+            default="adequate",
+        )
+        regions = (
+            agg.sort_values("beds_per_facility", kind="stable")
+            .rename_axis("region")
+            .reset_index()
+            .to_dict("records")
+        )
+        n_critical = int((agg["status"] == "critical").sum())
+        avg_beds = round(float(agg["beds_per_facility"].mean()), 1) if len(agg) else 0
 
         return {
             "scenario": "capacity_planning",
             "title": "📊 Regional Capacity Analysis",
             "total_regions": len(regions),
-            "critical_regions": len([r for r in regions if r["status"] == "critical"]),
+            "critical_regions": n_critical,
             "regions": regions,
             "action_steps": [
-                f"1. {len([r for r in regions if r['status']=='critical'])} regions critically under-resourced",
-                f"2. Average beds/facility across Ghana: {round(sum(r['beds_per_facility'] for r in regions)/len(regions), 1) if regions else 0}",
+                f"1. {n_critical} regions critically under-resourced",
+                f"2. Average beds/facility across Ghana: {avg_beds}",
                 f"3. Focus hiring in regions with lowest doctor ratios",
                 f"4. Consider bed expansion in critical regions first",
             ],
@@ -679,37 +1100,30 @@ class PlanningAgent:
         ctx = context or {}
         use_quantum = ctx.get("use_quantum", False) or "quantum" in ql
 
-        # Extract specialty
-        specialty = None
-        for sid, kws in MEDICAL_SPECIALTIES_MAP.items():
-            for kw in kws:
-                if kw in ql:
-                    specialty = sid
-                    break
-            if specialty:
-                break
+        specialty = _detect_specialty(ql)
 
         # Extract equipment
-        equipment = None
-        for eq in ["ct scanner", "mri", "dialysis", "ultrasound", "x-ray", "ventilator", "oxygen"]:
-            if eq in ql:
-                equipment = eq.title()
-                break
+        equipment = _EQUIPMENT_SCANNER.first(ql)
+        if equipment:
+            equipment = equipment.title()
+
+        m = _INTENT_RE.match(ql)
+        intent = m.lastgroup if m else None
 
-        if re.search(r"emergenc|route.*patient|nearest.*capable|urgent", ql):
+        if intent == "emergency":
             result = self.emergency_routing(
                 specialty,
                 ctx.get("lat"), ctx.get("lng")
             )
-        elif re.search(r"specialist.*rotat|deploy.*(doctor|specialist|surgeon|cardiolog|dentist|pediatri)|visiting.*route|rotation.*plan|multi.*stop.*tour", ql):
+        elif intent == "specialist":
             result = self.specialist_deployment(specialty, use_quantum=use_quantum)
-        elif re.search(r"equipment.*distribut|mobile.*unit|place.*scanner|deploy.*equip", ql):
+        elif intent == "equipment":
             result = self.equipment_distribution(equipment or "CT scanner")
-        elif re.search(r"new.*facilit|build.*hospital|where.*build|optimal.*location", ql):
+        elif intent == "facility":
             result = self.new_facility_placement(specialty)
-        elif re.search(r"capacity|bed.*need|staff.*need|overload|bottleneck", ql):
+        elif intent == "capacity":
             result = self.capacity_planning()
-        elif re.search(r"scenario|plan.*option|what.*can.*plan", ql):
+        elif intent == "scenario":
             result = self.list_scenarios()
         else:
             # Default: emergency routing (most common IDP need)
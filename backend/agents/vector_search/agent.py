@@ -11,24 +11,164 @@ Reciprocal Rank Fusion (RRF) for robust multi-representation retrieval:
 Applies metadata filters extracted from query text.
 """
 
-import re
+import copy
 import logging
+import threading
 import time
-from collections import defaultdict
-from typing import Dict, List, Optional
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
 
 from backend.core.config import (
     COLLECTION_FACILITIES, MEDICAL_SPECIALTIES_MAP,
     VEC_CLINICAL, VEC_FULL, VEC_SPECIALTIES,
 )
-from backend.core.vectorstore import get_qdrant_client, load_embedding_model, search_facilities
+from backend.core.keywords import KeywordScanner
+from backend.core.vectorstore import search_facilities, search_facilities_batch
 from backend.core.databricks import is_databricks_backend, search_via_databricks
 
 # RRF constant (standard value from the original RRF paper, Cormack+ 2009)
 RRF_K = 60
 
+# Named vectors queried per search, in fusion order
+_VECTOR_ORDER = (VEC_FULL, VEC_CLINICAL, VEC_SPECIALTIES)
+
+# Fused results per (query, top_k).  Vectors only change when the ingestion
+# pipeline re-runs; the TTL bounds how stale a cached answer can get.
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL_S = 300.0
+
 logger = logging.getLogger(__name__)
 
+# ── Query keyword vocabularies ───────────────────────────────────────────────
+CLINICAL_KEYWORDS = [
+    "procedure", "equipment", "surgery", "operation", "device",
+    "machine", "scanner", "theater", "operating", "diagnostic",
+    "ct scan", "mri", "x-ray", "ultrasound", "laboratory",
+    "icu", "nicu", "ventilator", "oxygen", "bed capacity",
+]
+SPECIALTY_KEYWORDS = [
+    "specialty", "specialties", "speciali",
+    "cardiology", "ophthalmology", "orthopedic", "pediatric",
+    "obstetric", "gynecology", "neurology", "oncology",
+    "dermatology", "psychiatry", "radiology", "anesthesia",
+    "dentistry", "dental",
+]
+# Longer names first, word-boundary matching
+FILTER_CITIES = [
+    "Cape Coast", "Accra", "Kumasi", "Tamale", "Takoradi",
+    "Sunyani", "Bolgatanga", "Koforidua", "Tema", "Wa", "Ho",
+]
+FACILITY_TYPES = ["hospital", "clinic", "pharmacy", "dentist"]
+
+# One scanner for every substring vocabulary the agent looks at; labels are
+# (category, value) pairs.  Cities need word boundaries, so they get their own.
+_QUERY_SCANNER = KeywordScanner(
+    [(kw, ("clinical", kw)) for kw in CLINICAL_KEYWORDS]
+    + [(kw, ("specialty_kw", kw)) for kw in SPECIALTY_KEYWORDS]
+    + [(ft, ("facility_type", ft)) for ft in FACILITY_TYPES]
+    + [
+        (kw, ("specialty", spec_id))
+        for spec_id, keywords in MEDICAL_SPECIALTIES_MAP.items()
+        for kw in keywords
+    ]
+    + [("ngo", ("org", "ngo")), ("non-governmental", ("org", "ngo")),
+       ("facility", ("org", "facility"))]
+)
+_CITY_SCANNER = KeywordScanner(((c.lower(), c) for c in FILTER_CITIES), word_boundary=True)
+
+
+class _ParsedQuery(NamedTuple):
+    vector: str
+    filters: Tuple[Tuple[str, Any], ...]  # dict items; list values as tuples
+    clinical_hits: int
+    specialty_hits: int
+
+
+# ── Memoised query parsing (keyed by the lower-cased query) ──────────────────
+
+@lru_cache(maxsize=2048)
+def _parse_query(ql: str) -> _ParsedQuery:
+    """Single scan feeding vector selection, filters and vector weights."""
+    hits: Dict[str, List[str]] = defaultdict(list)
+    for category, value in _QUERY_SCANNER.labels(ql):
+        hits[category].append(value)
+
+    if hits["clinical"]:
+        vector = VEC_CLINICAL
+    elif hits["specialty_kw"]:
+        vector = VEC_SPECIALTIES
+    else:
+        vector = VEC_FULL
+
+    filters: Dict[str, Any] = {}
+
+    if "ngo" in hits["org"]:
+        filters["org_type"] = "ngo"
+    elif "facility" in hits["org"]:
+        filters["org_type"] = "facility"
+
+    if hits["facility_type"]:
+        filters["facility_type"] = hits["facility_type"][0]
+
+    city = _CITY_SCANNER.first(ql)
+    if city:
+        filters["city"] = city
+
+    if hits["specialty"]:
+        filters["specialties_filter"] = tuple(hits["specialty"])
+
+    return _ParsedQuery(
+        vector=vector,
+        filters=tuple(filters.items()),
+        clinical_hits=len(hits["clinical"]),
+        specialty_hits=len(hits["specialty_kw"]),
+    )
+
+
+_result_cache: "OrderedDict[Tuple[str, int], Tuple[float, Dict]]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _get_cached_result(key: Tuple[str, int]) -> Optional[Dict]:
+    with _result_cache_lock:
+        hit = _result_cache.get(key)
+        if hit is None:
+            return None
+        stored_at, result = hit
+        if time.monotonic() - stored_at > RESULT_CACHE_TTL_S:
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+    return copy.deepcopy(result)  # callers may mutate what they get back
+
+
+def _put_cached_result(key: Tuple[str, int], result: Dict) -> None:
+    snapshot = copy.deepcopy(result)
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic(), snapshot)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def _top_k_desc(scores: np.ndarray, k: int) -> np.ndarray:
+    """Slots of the ``k`` highest scores, best first.
+
+    Same order as ``np.argsort(-scores, kind="stable")[:k]``, but only the
+    candidates at or above the k-th score (ties included) get sorted.
+    """
+    k = max(0, min(k, scores.size))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    neg = -scores
+    kth = np.partition(neg, k - 1)[k - 1]
+    candidates = np.flatnonzero(neg <= kth)
+    return candidates[np.argsort(neg[candidates], kind="stable")[:k]]
+
 
 class VectorSearchAgent:
     """Semantic search agent with auto vector selection and metadata filtering."""
@@ -40,61 +180,16 @@ class VectorSearchAgent:
     # ── Vector selection ─────────────────────────────────────────────────────
 
     def _select_vector(self, query: str) -> str:
-        ql = query.lower()
-        clinical = [
-            "procedure", "equipment", "surgery", "operation", "device",
-            "machine", "scanner", "theater", "operating", "diagnostic",
-            "ct scan", "mri", "x-ray", "ultrasound", "laboratory",
-            "icu", "nicu", "ventilator", "oxygen", "bed capacity",
-        ]
-        if any(kw in ql for kw in clinical):
-            return VEC_CLINICAL
-
-        specialty = [
-            "specialty", "specialties", "speciali",
-            "cardiology", "ophthalmology", "orthopedic", "pediatric",
-            "obstetric", "gynecology", "neurology", "oncology",
-            "dermatology", "psychiatry", "radiology", "anesthesia",
-            "dentistry", "dental",
-        ]
-        if any(kw in ql for kw in specialty):
-            return VEC_SPECIALTIES
-
-        return VEC_FULL
+        return _parse_query(query.lower()).vector
 
     # ── Filter extraction ────────────────────────────────────────────────────
 
     def _extract_filters(self, query: str) -> Dict:
-        filters = {}
-        ql = query.lower()
-
-        if "ngo" in ql or "non-governmental" in ql:
-            filters["org_type"] = "ngo"
-        elif "facility" in ql and "ngo" not in ql:
-            filters["org_type"] = "facility"
-
-        for ftype in ["hospital", "clinic", "pharmacy", "dentist"]:
-            if ftype in ql:
-                filters["facility_type"] = ftype
-                break
-
-        # Cities — longer names first, word-boundary matching
-        cities = [
-            "Cape Coast", "Accra", "Kumasi", "Tamale", "Takoradi",
-            "Sunyani", "Bolgatanga", "Koforidua", "Tema", "Wa", "Ho",
-        ]
-        for city in cities:
-            if re.search(r'\b' + re.escape(city.lower()) + r'\b', ql):
-                filters["city"] = city
-                break
-
-        for spec_id, keywords in MEDICAL_SPECIALTIES_MAP.items():
-            for kw in keywords:
-                if kw in ql:
-                    filters.setdefault("specialties_filter", []).append(spec_id)
-                    break
-
-        return filters
+        # Fresh dict (and lists) per call — the cached value is shared
+        return {
+            k: list(v) if isinstance(v, tuple) else v
+            for k, v in _parse_query(query.lower()).filters
+        }
 
     # ── RRF fusion search ──────────────────────────────────────────────────────
 
@@ -102,8 +197,15 @@ class VectorSearchAgent:
         """
         Multi-vector Reciprocal Rank Fusion search.
         Queries all 3 named vectors, fuses with RRF, and returns top_k.
+        Complete results are cached per (query, top_k) for RESULT_CACHE_TTL_S.
         """
         t0 = time.time()
+        cache_key = (query, top_k)
+        cached = _get_cached_result(cache_key)
+        if cached is not None:
+            cached["duration_ms"] = round((time.time() - t0) * 1000, 2)
+            return cached
+
         filters = self._extract_filters(query)
 
         filter_kwargs = {
@@ -118,49 +220,68 @@ class VectorSearchAgent:
 
         # Query all 3 named vectors (fetch more candidates for fusion)
         fetch_k = min(top_k * 3, 30)
-        results_by_vector: Dict[str, List[Dict]] = {}
         use_databricks = is_databricks_backend()
 
-        for vec_name in [VEC_FULL, VEC_CLINICAL, VEC_SPECIALTIES]:
+        results_by_vector: Dict[str, Optional[List[Dict]]]
+        if use_databricks:
+            # One serving call per vector: independent round-trips, so run
+            # them concurrently and collect in vector order for fusion.
+            with ThreadPoolExecutor(max_workers=len(_VECTOR_ORDER)) as pool:
+                futures = {
+                    vec_name: pool.submit(self._search_databricks, query, vec_name, fetch_k)
+                    for vec_name in _VECTOR_ORDER
+                }
+                results_by_vector = {vec_name: f.result() for vec_name, f in futures.items()}
+        else:
+            # Qdrant: all three named vectors in one batched round trip
             try:
-                if use_databricks:
-                    results_by_vector[vec_name] = search_via_databricks(
-                        query=query,
-                        vector_name=vec_name,
-                        top_k=fetch_k,
-                    )
-                else:
-                    results_by_vector[vec_name] = search_facilities(
-                        query=query,
-                        vector_name=vec_name,
-                        top_k=fetch_k,
-                        **filter_kwargs,
-                    )
+                results_by_vector = search_facilities_batch(
+                    query=query,
+                    vector_names=list(_VECTOR_ORDER),
+                    top_k=fetch_k,
+                    **filter_kwargs,
+                )
             except Exception as e:
-                logger.warning("Vector search failed for %s: %s", vec_name, e)
-                results_by_vector[vec_name] = []
+                logger.warning("Vector search failed: %s", e)
+                results_by_vector = {vec_name: None for vec_name in _VECTOR_ORDER}
+        complete = all(r is not None for r in results_by_vector.values())
+        results_by_vector = {v: r or [] for v, r in results_by_vector.items()}
 
         search_backend = "databricks_model_serving" if use_databricks else "qdrant_cloud"
 
         # ── Reciprocal Rank Fusion ──
-        rrf_scores: Dict[str, float] = defaultdict(float)
-        doc_map: Dict[str, Dict] = {}
-
+        # Intern each doc id to an integer slot (first-seen order; keep that
+        # payload), then sum all weighted reciprocal ranks per slot in one
+        # bincount.  It adds in input order, like a per-doc running sum, so
+        # scores are identical; only the kept top_k docs are copied.
+        slot_of: Dict[str, int] = {}
+        doc_map: List[Dict] = []
+        slots: List[int] = []
+        contributions = []
         for vec_name, results in results_by_vector.items():
             w = weights.get(vec_name, 1.0)
-            for rank, doc in enumerate(results):
+            for doc in results:
                 doc_id = str(doc["id"])
-                rrf_scores[doc_id] += w / (RRF_K + rank + 1)
-                # Keep the richest payload version
-                if doc_id not in doc_map:
-                    doc_map[doc_id] = doc
-
-        # Sort by fused score and take top_k
-        ranked_ids = sorted(rrf_scores, key=rrf_scores.get, reverse=True)[:top_k]
+                slot = slot_of.get(doc_id)
+                if slot is None:
+                    slot = slot_of[doc_id] = len(doc_map)
+                    doc_map.append(doc)
+                slots.append(slot)
+            contributions.append(w / (RRF_K + np.arange(len(results)) + 1))
+
+        if slots:
+            rrf_scores = np.bincount(
+                slots, weights=np.concatenate(contributions), minlength=len(doc_map)
+            )
+        else:
+            rrf_scores = np.zeros(0)
+
+        # Take top_k by fused score (ties keep first-seen order)
+        ranked = _top_k_desc(rrf_scores, top_k)
         fused_results = []
-        for doc_id in ranked_ids:
-            doc = doc_map[doc_id].copy()
-            doc["rrf_score"] = round(rrf_scores[doc_id], 4)
+        for slot in ranked:
+            doc = doc_map[slot].copy()
+            doc["rrf_score"] = round(float(rrf_scores[slot]), 4)
             fused_results.append(doc)
 
         duration = (time.time() - t0) * 1000
@@ -177,7 +298,7 @@ class VectorSearchAgent:
             for r in fused_results
         ]
 
-        return {
+        result = {
             "query": query,
             "agent": "vector_search",
             "search_method": "reciprocal_rank_fusion",
@@ -191,6 +312,19 @@ class VectorSearchAgent:
             "citations": citations,
             "duration_ms": round(duration, 2),
         }
+        # Partial results (a vector search failed) are not cached
+        if complete:
+            _put_cached_result(cache_key, result)
+        return result
+
+    @staticmethod
+    def _search_databricks(query: str, vec_name: str, top_k: int) -> Optional[List[Dict]]:
+        """One named-vector search; None on failure so fusion stays partial."""
+        try:
+            return search_via_databricks(query=query, vector_name=vec_name, top_k=top_k)
+        except Exception as e:
+            logger.warning("Vector search failed for %s: %s", vec_name, e)
+            return None
 
     def _compute_vector_weights(self, query: str) -> Dict[str, float]:
         """Assign per-vector weights based on query content.
@@ -202,24 +336,9 @@ class VectorSearchAgent:
         clinical vector 3x the weight of full_document, making broad matches
         almost invisible).
         """
-        ql = query.lower()
-
-        clinical_kws = [
-            "procedure", "equipment", "surgery", "operation", "device",
-            "machine", "scanner", "theater", "operating", "diagnostic",
-            "ct scan", "mri", "x-ray", "ultrasound", "laboratory",
-            "icu", "nicu", "ventilator", "oxygen", "bed capacity",
-        ]
-        specialty_kws = [
-            "specialty", "specialties", "speciali",
-            "cardiology", "ophthalmology", "orthopedic", "pediatric",
-            "obstetric", "gynecology", "neurology", "oncology",
-            "dermatology", "psychiatry", "radiology", "anesthesia",
-            "dentistry", "dental",
-        ]
-
-        clinical_hits = sum(1 for kw in clinical_kws if kw in ql)
-        specialty_hits = sum(1 for kw in specialty_kws if kw in ql)
+        parsed = _parse_query(query.lower())
+        clinical_hits = parsed.clinical_hits
+        specialty_hits = parsed.specialty_hits
 
         # Raw affinity: 1 (base) + hits (capped at 3)
         raw_full = 1.0
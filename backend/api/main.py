@@ -4,24 +4,74 @@ MedBridge AI — FastAPI Application
 Main FastAPI app with CORS, lifespan events, and route mounting.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from backend.api.routes import router
+try:
+    import orjson  # noqa: F401  (ORJSONResponse needs it at render time)
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+from backend.api.routes import router, warm_caches, warm_planning
+from backend.core.databricks import close_session
+
+
+# Streamed endpoints: gzip would hold their chunks back until it has a full
+# compression block, so the client would get the whole stream in one burst
+_UNCOMPRESSED_PATHS = frozenset({"/api/query/stream"})
+
+
+class _GZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the streamed endpoints through untouched."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in _UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def _warm_workflow() -> None:
+    # Imports the agents and compiles the graph that run_query will use
+    from backend.orchestration.graph import get_workflow
+    get_workflow()
+
+
+def _warm_embedding_model() -> None:
+    try:
+        from backend.core.vectorstore import load_embedding_model
+        load_embedding_model()
+    except Exception as e:
+        print(f"[!] Embedding model not preloaded: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Warm up agent singletons on startup."""
     print("[*] MedBridge AI - warming up agents...")
-    # Pre-load the orchestration workflow (loads data + models once)
-    from backend.orchestration.graph import build_workflow
-    build_workflow()
+    # Independent loads run side by side, so startup costs the slowest of
+    # them rather than the sum
+    await asyncio.gather(
+        asyncio.to_thread(_warm_workflow),
+        asyncio.to_thread(_warm_embedding_model),
+        # Preprocessing + facility table + dashboard aggregates
+        asyncio.to_thread(warm_caches),
+    )
+    # Kept on the main thread: it makes the first numba-parallel launch, and
+    # a TBB threading layer first started from a worker thread hangs the
+    # interpreter at exit.  Later launches come from request worker threads;
+    # the planning agent holds a lock around them, as numba's workqueue layer
+    # aborts on concurrent launches
+    warm_planning()
     print("[+] Agents ready")
     yield
     print("[*] Shutting down MedBridge AI")
+    close_session()
 
 
 app = FastAPI(
@@ -29,6 +79,7 @@ app = FastAPI(
     description="Multi-Agent Healthcare Intelligence for Ghana",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 # CORS — allow React dev server
@@ -39,6 +90,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# /facilities is a few hundred KB of repetitive JSON
+app.add_middleware(_GZipMiddleware, minimum_size=1024)
 
 # Mount routes
 app.include_router(router, prefix="/api")
@@ -4,15 +4,24 @@ MedBridge AI — API Routes
 REST endpoints for the React frontend.
 """
 
+import asyncio
+import json
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
+import numpy as np
+import pandas as pd
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
 
-from backend.orchestration.graph import run_query
-from backend.core.preprocessing import run_preprocessing
-from backend.agents.planning.agent import PlanningAgent
 from backend.core.databricks import (
     is_databricks_backend,
     get_mlflow_run_info,
@@ -22,14 +31,17 @@ from backend.core.databricks import (
 router = APIRouter()
 
 # ── Cached agent singletons (avoid re-processing CSV per request) ────────────
-_planning_agent: Optional[PlanningAgent] = None
+# Agents, the workflow and preprocessing are imported on first use so that
+# importing the app stays cheap; the lifespan hook warms them in parallel.
+_planning_agent = None  # lazy-imported
 _geospatial_agent = None  # lazy-imported
 _medical_reasoning_agent = None  # lazy-imported
 
 
-def _get_planning_agent() -> PlanningAgent:
+def _get_planning_agent():
     global _planning_agent
     if _planning_agent is None:
+        from backend.agents.planning.agent import PlanningAgent
         _planning_agent = PlanningAgent()
     return _planning_agent
 
@@ -42,9 +54,48 @@ def _get_geospatial_agent():
     return _geospatial_agent
 
 
+# Medical-desert analysis per specialty for /routing-map (the data is
+# immutable).  Only known specialty ids (and None) are cached, so arbitrary
+# client strings can't grow it.
+_desert_cache: Dict[Optional[str], Dict] = {}
+
+
+def _get_medical_deserts(specialty: Optional[str]) -> Dict:
+    deserts = _desert_cache.get(specialty)
+    if deserts is None:
+        from backend.core.config import MEDICAL_SPECIALTIES_MAP
+
+        deserts = _get_geospatial_agent().identify_medical_deserts(specialty)
+        if specialty is None or specialty in MEDICAL_SPECIALTIES_MAP:
+            _desert_cache[specialty] = deserts
+    return deserts
+
+
+def warm_planning() -> None:
+    """Precompute medical deserts for every known specialty and run one
+    routing, one rotation and one placement query (compiles the planning
+    kernels), so the first /routing-map and /planning/execute calls are
+    warm.  Call it from the main thread: the placement query makes the first
+    numba-parallel launch."""
+    from backend.core.config import MEDICAL_SPECIALTIES_MAP
+
+    for specialty in [None, *MEDICAL_SPECIALTIES_MAP]:
+        _get_medical_deserts(specialty)
+    planning = _get_planning_agent()
+    planning.execute_query("emergency routing")
+    planning.execute_query("specialist rotation plan")
+    planning.execute_query("new facility placement")
+
+
 # ── Request / Response Models ────────────────────────────────────────────────
 
+# Request bodies: trim stray whitespace from every string field, drop unknown keys
+_REQUEST_CONFIG = ConfigDict(str_strip_whitespace=True, extra="ignore")
+
+
 class QueryRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     query: str
     context: Optional[Dict[str, Any]] = None
 
@@ -74,52 +125,101 @@ class FacilityListItem(BaseModel):
 
 
 # ── Cached data ──────────────────────────────────────────────────────────────
-_facilities_cache: Optional[List[Dict]] = None
-
-
-def _get_facilities() -> List[Dict]:
-    global _facilities_cache
-    if _facilities_cache is not None:
-        return _facilities_cache
-
-    df = run_preprocessing()
-    facilities = []
-    for _, row in df.iterrows():
-        m = row["metadata"]
-        lat = m.get("latitude")
-        lng = m.get("longitude")
-        try:
-            lat = float(lat) if lat else None
-            lng = float(lng) if lng else None
-        except (ValueError, TypeError):
-            lat, lng = None, None
-
-        cap = m.get("capacity")
-        docs = m.get("numberDoctors")
-        try:
-            cap = float(cap) if cap else None
-        except (ValueError, TypeError):
-            cap = None
-        try:
-            docs = float(docs) if docs else None
-        except (ValueError, TypeError):
-            docs = None
-
-        facilities.append({
-            "name": m.get("name", "Unknown"),
-            "city": m.get("address_city"),
-            "region": m.get("address_stateOrRegion"),
-            "org_type": m.get("organization_type"),
-            "facility_type": m.get("facilityTypeId"),
-            "latitude": lat,
-            "longitude": lng,
-            "specialties": m.get("specialties", []),
-            "capacity": cap,
-            "doctors": docs,
-        })
-
-    _facilities_cache = facilities
-    return facilities
+# Facilities are held column-wise; row dicts are only materialised for the
+# serialized /facilities body and the /routing-map background markers.
+_facilities_df: Optional[pd.DataFrame] = None
+_specialties_df: Optional[pd.DataFrame] = None
+_map_facilities_cache: Optional[List[Dict]] = None
+# Dashboard aggregates: the facility data is immutable for the process lifetime
+_stats_cache: Optional[Dict[str, Any]] = None
+_specialties_cache: Optional[Dict[str, Any]] = None
+_with_coords_cache: Optional[int] = None
+# Serialized bodies of the immutable GET payloads, keyed by endpoint
+_json_cache: Dict[str, bytes] = {}
+
+
+def _load_facilities() -> None:
+    """Build the columnar facility table and its exploded specialties."""
+    global _facilities_df, _specialties_df
+    from backend.core.preprocessing import run_preprocessing
+
+    metadata = run_preprocessing()["metadata"].tolist()
+    n = len(metadata)
+
+    names = np.empty(n, dtype=object)
+    cities = np.empty(n, dtype=object)
+    regions = np.empty(n, dtype=object)
+    org_types = np.empty(n, dtype=object)
+    facility_types = np.empty(n, dtype=object)
+    raw_lat = np.empty(n, dtype=object)
+    raw_lng = np.empty(n, dtype=object)
+    raw_cap = np.empty(n, dtype=object)
+    raw_docs = np.empty(n, dtype=object)
+    specialties: List[List[str]] = [None] * n
+
+    for i, m in enumerate(metadata):
+        names[i] = m.get("name", "Unknown")
+        cities[i] = m.get("address_city")
+        regions[i] = m.get("address_stateOrRegion")
+        org_types[i] = m.get("organization_type")
+        facility_types[i] = m.get("facilityTypeId")
+        raw_lat[i] = m.get("latitude") or None
+        raw_lng[i] = m.get("longitude") or None
+        raw_cap[i] = m.get("capacity") or None
+        raw_docs[i] = m.get("numberDoctors") or None
+        specialties[i] = m.get("specialties", [])
+
+    lat = pd.to_numeric(raw_lat, errors="coerce").astype(np.float64)
+    lng = pd.to_numeric(raw_lng, errors="coerce").astype(np.float64)
+    # An unparseable coordinate drops the pair, as the per-row float() did
+    bad_coords = (np.isnan(lat) & pd.notna(raw_lat)) | (np.isnan(lng) & pd.notna(raw_lng))
+    lat[bad_coords] = np.nan
+    lng[bad_coords] = np.nan
+
+    df = pd.DataFrame({
+        "name": names,
+        "city": cities,
+        "region": regions,
+        "org_type": org_types,
+        "facility_type": facility_types,
+        "latitude": lat,
+        "longitude": lng,
+        "specialties": specialties,
+        "capacity": pd.to_numeric(raw_cap, errors="coerce").astype(np.float64),
+        "doctors": pd.to_numeric(raw_docs, errors="coerce").astype(np.float64),
+    }, copy=False)
+
+    _specialties_df = (
+        df[["specialties"]].explode("specialties", ignore_index=True)
+        .dropna().rename(columns={"specialties": "name"})
+    )
+    _facilities_df = df
+
+
+def _get_facilities_df() -> pd.DataFrame:
+    if _facilities_df is None:
+        _load_facilities()
+    return _facilities_df
+
+
+def _get_specialties_df() -> pd.DataFrame:
+    if _specialties_df is None:
+        _load_facilities()
+    return _specialties_df
+
+
+def _value_counts(values: pd.Series, by_count: bool = True) -> List[tuple]:
+    """(value, count) pairs in first-seen order, or most frequent first (stable).
+
+    One hash-table pass; a missing value is counted under ``None``.
+    """
+    counts = values.value_counts(sort=False, dropna=False)
+    if by_count:
+        counts = counts.sort_values(ascending=False, kind="stable")
+    return [
+        (None if pd.isna(value) else value, count)
+        for value, count in zip(counts.index.tolist(), counts.tolist())
+    ]
 
 
 # ── Endpoints ────────────────────────────────────────────────────────────────
@@ -133,20 +233,26 @@ async def health():
 async def query_endpoint(req: QueryRequest):
     """Run a natural language query through the LangGraph multi-agent workflow."""
     # Guard: reject empty or excessively long queries
-    if not req.query or not req.query.strip():
+    if not req.query:
         raise HTTPException(status_code=400, detail="Query cannot be empty")
     if len(req.query) > 2000:
         raise HTTPException(status_code=400, detail="Query too long (max 2000 characters)")
 
+    from backend.orchestration.graph import run_query
+
     t0 = time.time()
     try:
-        result = run_query(req.query, req.context)
+        # The workflow is blocking (LLM, vector search, agents): run it off
+        # the event loop so other requests keep being served meanwhile
+        result = await asyncio.to_thread(run_query, req.query, req.context)
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="Internal processing error. Please try again.")
 
-    return QueryResponse(
+    # The workflow's own output: build the response model without re-validating
+    # it here (FastAPI still validates against response_model on the way out)
+    return QueryResponse.model_construct(
         query=result.get("query", req.query),
         intent=result.get("intent", "general"),
         response=result.get("response", {}),
@@ -158,74 +264,153 @@ async def query_endpoint(req: QueryRequest):
     )
 
 
+@router.post("/query/stream")
+async def query_stream_endpoint(req: QueryRequest):
+    """``/query`` with the LLM summary streamed as it is generated.
+
+    Newline-delimited JSON: one ``{"type": "result", ...}`` line carrying the
+    ``/query`` payload (empty ``summary``) as soon as the agents finish, then
+    ``{"type": "summary", "text": ...}`` chunks, then ``{"type": "done"}``.
+    """
+    if not req.query:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    if len(req.query) > 2000:
+        raise HTTPException(status_code=400, detail="Query too long (max 2000 characters)")
+
+    from backend.orchestration.graph import run_query
+    from backend.core.llm import synthesize_response_stream
+
+    try:
+        result = await asyncio.to_thread(run_query, req.query, req.context, False)
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal processing error. Please try again.")
+
+    agent_results = result.pop("agent_results", [])
+
+    def events() -> Iterator[bytes]:
+        # Sync generator: Starlette iterates it in a worker thread
+        yield _dump_json({"type": "result", **jsonable_encoder(result)}) + b"\n"
+        for text in synthesize_response_stream(
+            query=result.get("query", req.query),
+            agent_results=agent_results,
+            trace=result.get("trace", []),
+            citations=result.get("citations", []),
+            intent=result.get("intent", ""),
+        ):
+            yield _dump_json({"type": "summary", "text": text}) + b"\n"
+        yield _dump_json({"type": "done"}) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/facilities")
 async def list_facilities():
     """Return all facilities (for map markers and stats)."""
-    facilities = _get_facilities()
-    return {"total": len(facilities), "facilities": facilities}
+    return _json_response("facilities", _facilities_payload)
 
 
-@router.get("/stats")
-async def get_stats():
-    """Aggregate statistics for the dashboard."""
-    facilities = _get_facilities()
-
-    total = len(facilities)
-    with_coords = sum(1 for f in facilities if f["latitude"] is not None)
-    org_types = {}
-    regions = {}
-    all_specialties = set()
-    total_beds = 0
-    total_docs = 0
-
-    for f in facilities:
-        # Org type
-        ot = f.get("org_type", "Unknown")
-        org_types[ot] = org_types.get(ot, 0) + 1
-
-        # Region
-        reg = f.get("region") or "Unknown"
-        regions[reg] = regions.get(reg, 0) + 1
-
-        # Specialties
-        for s in f.get("specialties", []):
-            all_specialties.add(s)
-
-        # Capacity
-        if f.get("capacity"):
-            total_beds += f["capacity"]
-        if f.get("doctors"):
-            total_docs += f["doctors"]
+def _get_stats() -> Dict[str, Any]:
+    global _stats_cache
+    if _stats_cache is not None:
+        return _stats_cache
 
+    df = _get_facilities_df()
+    org_types = dict(_value_counts(df["org_type"], by_count=False))
     # Top 10 regions
-    sorted_regions = sorted(regions.items(), key=lambda x: x[1], reverse=True)
+    sorted_regions = _value_counts(df["region"].fillna("Unknown").replace("", "Unknown"))
 
-    return {
-        "total_facilities": total,
-        "with_coordinates": with_coords,
-        "total_beds": int(total_beds),
-        "total_doctors": int(total_docs),
+    _stats_cache = {
+        "total_facilities": len(df),
+        "with_coordinates": _get_with_coords(),
+        "total_beds": int(df["capacity"].sum()),
+        "total_doctors": int(df["doctors"].sum()),
         "organization_types": org_types,
-        "unique_specialties": len(all_specialties),
+        "unique_specialties": int(_get_specialties_df()["name"].nunique()),
         "top_regions": sorted_regions[:10],
         "all_regions": sorted_regions,
     }
+    return _stats_cache
 
 
-@router.get("/specialties")
-async def list_specialties():
-    """List all unique specialties with their counts."""
-    facilities = _get_facilities()
-    spec_counts = {}
-    for f in facilities:
-        for s in f.get("specialties", []):
-            spec_counts[s] = spec_counts.get(s, 0) + 1
+def _get_specialty_counts() -> Dict[str, Any]:
+    global _specialties_cache
+    if _specialties_cache is not None:
+        return _specialties_cache
 
-    sorted_specs = sorted(spec_counts.items(), key=lambda x: x[1], reverse=True)
-    return {
+    sorted_specs = _value_counts(_get_specialties_df()["name"])
+    _specialties_cache = {
         "total_unique": len(sorted_specs),
         "specialties": [{"name": s, "count": c} for s, c in sorted_specs],
     }
+    return _specialties_cache
+
+
+def _get_with_coords() -> int:
+    global _with_coords_cache
+    if _with_coords_cache is None:
+        _with_coords_cache = int(_get_facilities_df()["latitude"].notna().sum())
+    return _with_coords_cache
+
+
+def _dump_json(payload: Any) -> bytes:
+    if _ORJSON_AVAILABLE:
+        # Non-str keys (a None org type) are written as "null", like json.dumps
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    # Same encoding as Starlette's JSONResponse
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _cached_json(key: str, build: Callable[[], Any]) -> bytes:
+    body = _json_cache.get(key)
+    if body is None:
+        body = _json_cache[key] = _dump_json(build())
+    return body
+
+
+def _facility_records(df: pd.DataFrame) -> List[Dict]:
+    """Row dicts for JSON responses (NaN -> None)."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _facilities_payload() -> Dict[str, Any]:
+    facilities = _facility_records(_get_facilities_df())
+    return {"total": len(facilities), "facilities": facilities}
+
+
+def _get_map_facilities() -> List[Dict]:
+    """First 200 geo-located facilities: the /routing-map background markers."""
+    global _map_facilities_cache
+    if _map_facilities_cache is None:
+        df = _get_facilities_df()
+        _map_facilities_cache = _facility_records(df[df["latitude"].notna()].head(200))
+    return _map_facilities_cache
+
+
+def _json_response(key: str, build: Callable[[], Any]) -> Response:
+    return Response(content=_cached_json(key, build), media_type="application/json")
+
+
+def warm_caches() -> None:
+    """Load the facility table, precompute the dashboard aggregates and
+    serialize the immutable GET payloads."""
+    _cached_json("facilities", _facilities_payload)
+    _cached_json("stats", _get_stats)
+    _cached_json("specialties", _get_specialty_counts)
+    _get_map_facilities()
+
+
+@router.get("/stats")
+async def get_stats():
+    """Aggregate statistics for the dashboard."""
+    return _json_response("stats", _get_stats)
+
+
+@router.get("/specialties")
+async def list_specialties():
+    """List all unique specialties with their counts."""
+    return _json_response("specialties", _get_specialty_counts)
 
 
 # ── Planning endpoints ──────────────────────────────────────────────
@@ -274,6 +459,8 @@ async def list_planning_scenarios():
 
 
 class PlanningRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     scenario: str
     specialty: str | None = None
     equipment_type: str | None = None
@@ -282,6 +469,8 @@ class PlanningRequest(BaseModel):
 
 
 class RoutingMapRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     scenario: str = "emergency_routing"
     specialty: str | None = None
     origin_city: str | None = None
@@ -297,12 +486,7 @@ async def get_routing_map_data(req: RoutingMapRequest):
         # Geocode origin city if provided
         origin_lat, origin_lng = None, None
         if req.origin_city:
-            city_match = geo.valid_coords[
-                geo.valid_coords["address_city"].str.contains(req.origin_city, case=False, na=False)
-            ]
-            if not city_match.empty:
-                origin_lat = float(city_match["latitude"].mean())
-                origin_lng = float(city_match["longitude"].mean())
+            origin_lat, origin_lng = geo.city_centroid(req.origin_city)
 
         # Execute the planning scenario
         query_parts = [req.scenario.replace("_", " ")]
@@ -319,12 +503,11 @@ async def get_routing_map_data(req: RoutingMapRequest):
 
         plan_result = planning.execute_query(query, context=ctx)
 
-        # Get all facilities for map background
-        facilities = _get_facilities()
-        with_coords = [f for f in facilities if f["latitude"] is not None]
+        # Geo-located facilities for the map background
+        n_with_coords = _get_with_coords()
 
         # Get medical deserts
-        deserts = geo.identify_medical_deserts(req.specialty)
+        deserts = _get_medical_deserts(req.specialty)
 
         # Build route waypoints from plan result
         route = []
@@ -374,7 +557,7 @@ async def get_routing_map_data(req: RoutingMapRequest):
         # Reasoning steps for the sidebar
         reasoning = [
             {"step": 1, "title": "Query Analysis", "content": f"Scenario: {req.scenario}", "data": f"Specialty: {req.specialty or 'all'}"},
-            {"step": 2, "title": "Facility Search", "content": f"Searched {len(with_coords)} geo-located facilities", "data": f"Filter: {req.specialty or 'none'}"},
+            {"step": 2, "title": "Facility Search", "content": f"Searched {n_with_coords} geo-located facilities", "data": f"Filter: {req.specialty or 'none'}"},
             {"step": 3, "title": "Route Calculation", "content": f"Generated {len(route)} waypoints", "data": plan_result.get("title", "")},
             {"step": 4, "title": "Desert Detection", "content": f"Found {deserts.get('deserts_found', 0)} medical deserts", "data": f"Threshold: {deserts.get('threshold_km', 75)} km"},
         ]
@@ -382,7 +565,7 @@ async def get_routing_map_data(req: RoutingMapRequest):
         return {
             "status": "ok",
             "plan": plan_result,
-            "facilities": with_coords[:200],
+            "facilities": _get_map_facilities(),
             "route": route,
             "deserts": deserts.get("deserts", []),
             "reasoning": reasoning,
@@ -416,15 +599,15 @@ async def execute_planning(req: PlanningRequest):
         # Build context with coordinates if origin_city provided
         context = {"use_quantum": req.use_quantum}
         if req.origin_city:
-            geo = _get_geospatial_agent()
-            city_match = geo.valid_coords[
-                geo.valid_coords["address_city"].str.contains(req.origin_city, case=False, na=False)
-            ]
-            if not city_match.empty:
-                context["lat"] = float(city_match["latitude"].mean())
-                context["lng"] = float(city_match["longitude"].mean())
-
-        result = agent.execute_query(query, context=context)
+            lat, lng = _get_geospatial_agent().city_centroid(req.origin_city)
+            if lat is not None:
+                context["lat"] = lat
+                context["lng"] = lng
+
+        # Off the event loop: quantum-backed scenarios can take seconds.  The
+        # agent serializes its numba-parallel kernels, so concurrent workers
+        # are safe under any threading layer
+        result = await asyncio.to_thread(agent.execute_query, query, context=context)
         return {"status": "ok", "result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -460,15 +643,12 @@ async def mlops_pipeline_info():
         DATABRICKS_HOST, DATABRICKS_SERVING_ENDPOINT, VECTOR_SEARCH_BACKEND,
     )
 
-    facilities = _get_facilities()
-    with_coords = sum(1 for f in facilities if f["latitude"] is not None)
-
     return {
         "pipeline": {
             "data_source": "Virtue Foundation Ghana CSV",
             "preprocessing": {
-                "total_facilities": len(facilities),
-                "with_coordinates": with_coords,
+                "total_facilities": len(_get_facilities_df()),
+                "with_coordinates": _get_with_coords(),
                 "steps": ["load_csv", "clean_parse", "deduplicate", "geocode", "build_documents"],
             },
             "embedding": {
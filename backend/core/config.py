@@ -5,16 +5,21 @@ Central config for Qdrant, embedding models, agent settings, and medical domain
 """
 
 import os
+import re
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-load_dotenv()
-
 # ── Paths ────────────────────────────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 CSV_PATH = DATA_DIR / "Virtue Foundation Ghana v0.3 - Sheet1.csv"
 OUTPUT_DIR = PROJECT_ROOT / "output"
+CACHE_DIR = PROJECT_ROOT / ".cache"
+
+# The .env sits at the repo root (see README); loading it by path skips
+# find_dotenv's directory walk up from this file.
+load_dotenv(PROJECT_ROOT / ".env")
 
 # ── Qdrant Cloud ─────────────────────────────────────────────────────────────
 QDRANT_CLOUD_URL = os.getenv("QDRANT_CLOUD_URL")
@@ -30,6 +35,8 @@ VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "qdrant")  # "qdrant"
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "openai/gpt-oss-120b")
 GROQ_FALLBACK_MODEL = "llama-3.3-70b-versatile"
+# Reuse completions for byte-identical prompts (set to "false" when debugging prompts)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
 
 # ── Collections ──────────────────────────────────────────────────────────────
 COLLECTION_FACILITIES = "ghana_medical_facilities"
@@ -55,7 +62,9 @@ GHANA_BOUNDING_BOX = {
 }
 
 # ── Medical Domain Constants ─────────────────────────────────────────────────
-MEDICAL_SPECIALTIES_MAP = {
+# Shared read-only by every agent (and across worker threads), so the public
+# tables below are frozen views; keyword order is kept for deterministic scans.
+_MEDICAL_SPECIALTIES = {
     "cardiology": ["cardiology", "cardiac", "heart", "cardiovascular"],
     "ophthalmology": ["ophthalmology", "eye", "cataract", "retina", "ophthalmic"],
     "orthopedicSurgery": ["orthopedic", "orthopaedic", "bone", "fracture", "joint"],
@@ -72,9 +81,12 @@ MEDICAL_SPECIALTIES_MAP = {
     "neurosurgery": ["neurosurgery", "brain surgery", "neuro"],
     "plasticSurgery": ["plastic surgery", "reconstructive", "cleft"],
 }
+MEDICAL_SPECIALTIES_MAP = MappingProxyType(
+    {spec_id: tuple(keywords) for spec_id, keywords in _MEDICAL_SPECIALTIES.items()}
+)
 
 # ── Facility Capability Requirements (for Medical Reasoning Agent) ───────────
-ADVANCED_PROCEDURE_REQUIREMENTS = {
+_ADVANCED_PROCEDURES = {
     "neurosurgery": {
         "required_equipment": ["CT scanner", "MRI", "operating microscope"],
         "required_staff": ["neurosurgeon"],
@@ -112,6 +124,13 @@ ADVANCED_PROCEDURE_REQUIREMENTS = {
         "min_beds": 50,
     },
 }
+ADVANCED_PROCEDURE_REQUIREMENTS = MappingProxyType({
+    proc: MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in reqs.items()
+    })
+    for proc, reqs in _ADVANCED_PROCEDURES.items()
+})
 
 # ── Red-flag language patterns (for Medical Reasoning Agent) ──────────────────
 RED_FLAG_PATTERNS = {
@@ -133,3 +152,9 @@ RED_FLAG_PATTERNS = {
         r"state.of.the.art",
     ],
 }
+
+# Compiled once at import; the string dict above is kept for reporting
+RED_FLAG_PATTERNS_COMPILED = {
+    category: tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+    for category, patterns in RED_FLAG_PATTERNS.items()
+}
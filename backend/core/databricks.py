@@ -9,12 +9,23 @@ The served model was registered in the Databricks MLOps notebook:
   databricks/medbridge_mlops_pipeline.py  (Section 6)
 """
 
+import copy
 import json
 import logging
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
 
 from backend.core.config import (
     DATABRICKS_HOST,
@@ -29,19 +40,49 @@ logger = logging.getLogger(__name__)
 #  Databricks Model Serving client
 # ---------------------------------------------------------------------------
 
-_serving_url: Optional[str] = None
-
-
+@lru_cache(maxsize=1)
 def _get_serving_url() -> str:
     """Build the Databricks Model Serving invocation URL."""
-    global _serving_url
-    if _serving_url is None:
-        host = (DATABRICKS_HOST or "").rstrip("/")
-        endpoint = DATABRICKS_SERVING_ENDPOINT or "medbridge-vector-search"
-        _serving_url = f"{host}/serving-endpoints/{endpoint}/invocations"
-    return _serving_url
+    host = (DATABRICKS_HOST or "").rstrip("/")
+    endpoint = DATABRICKS_SERVING_ENDPOINT or "medbridge-vector-search"
+    return f"{host}/serving-endpoints/{endpoint}/invocations"
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
 
+def _get_session() -> requests.Session:
+    """Shared keep-alive session for all Databricks calls.
+
+    Pooled connections are reused across requests (and by the vector-search
+    agent's concurrent per-vector calls), so the TLS handshake is paid once
+    per connection rather than once per call.  The bearer token is set on
+    the session, so callers don't rebuild auth headers per request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Authorization"] = f"Bearer {DATABRICKS_TOKEN}"
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    """Close the pooled connections (app shutdown)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+@lru_cache(maxsize=1)
 def _is_databricks_configured() -> bool:
     """Check whether Databricks credentials are available."""
     return bool(
@@ -52,6 +93,7 @@ def _is_databricks_configured() -> bool:
     )
 
 
+@lru_cache(maxsize=1)
 def is_databricks_backend() -> bool:
     """Should the app route vector search through Databricks?"""
     return VECTOR_SEARCH_BACKEND == "databricks" and _is_databricks_configured()
@@ -68,21 +110,78 @@ _VEC_MAP = {
     "specialties_context": "vec_specialties_context",
 }
 
+# Endpoint results per (query, vector, top_k), so repeated lookups within an
+# agent chain skip the round-trip.  The served index only changes when the
+# MLOps pipeline re-runs; the TTL bounds how stale a cached answer can get.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL_S = 300.0
+_search_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, List[Dict]]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def _json_loads(raw):
+    """Decode JSON text/bytes, with orjson when available.
+
+    orjson rejects the NaN/Infinity literals Python's encoder emits for
+    missing floats, so such payloads go through the stdlib decoder.
+    """
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _get_cached_search(key: Tuple[str, str, int]) -> Optional[List[Dict]]:
+    with _search_cache_lock:
+        hit = _search_cache.get(key)
+        if hit is None:
+            return None
+        stored_at, results = hit
+        if time.monotonic() - stored_at > SEARCH_CACHE_TTL_S:
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+    return copy.deepcopy(results)  # callers may mutate what they get back
+
+
+def _put_cached_search(key: Tuple[str, str, int], results: List[Dict]) -> None:
+    snapshot = copy.deepcopy(results)
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic(), snapshot)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+
+def clear_search_cache() -> None:
+    """Drop all cached endpoint results (e.g. after re-indexing)."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
 
 def search_via_databricks(
     query: str,
     vector_name: str = "full_document",
     top_k: int = 10,
-) -> List[Dict]:
+) -> Optional[List[Dict]]:
     """
     Call the Databricks Model Serving endpoint for vector search.
 
     Returns the same schema as ``vectorstore.search_facilities()``
-    so the vector-search agent can swap transparently.
+    so the vector-search agent can swap transparently, or None when the
+    endpoint is unreachable, errors or sends no predictions (so an outage is
+    never mistaken for an empty result).  Successful responses are cached
+    per (query, vector, top_k) for SEARCH_CACHE_TTL_S.
     """
     t0 = time.time()
     url = _get_serving_url()
     mapped_vec = _VEC_MAP.get(vector_name, f"vec_{vector_name}")
+    cache_key = (query, mapped_vec, top_k)
+    cached = _get_cached_search(cache_key)
+    if cached is not None:
+        return cached
 
     payload = {
         "dataframe_records": [
@@ -94,65 +193,92 @@ def search_via_databricks(
         ]
     }
 
-    headers = {
-        "Authorization": f"Bearer {DATABRICKS_TOKEN}",
-        "Content-Type": "application/json",
-    }
-
     try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=30)
+        resp = _get_session().post(url, json=payload, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
 
         # Model Serving returns {"predictions": [{"results": "..."}]}
         predictions = data.get("predictions", [])
         if not predictions:
             logger.warning("Databricks returned empty predictions for query: %s", query[:80])
-            return []
+            return None
 
         raw = predictions[0] if isinstance(predictions, list) else predictions
         results_json = raw.get("results", "[]") if isinstance(raw, dict) else raw
-        results = json.loads(results_json) if isinstance(results_json, str) else results_json
+        results = _json_loads(results_json) if isinstance(results_json, (str, bytes)) else results_json
 
         duration = (time.time() - t0) * 1000
         logger.info(
             "Databricks search: %d results in %.0fms (vec=%s)",
             len(results), duration, mapped_vec,
         )
+        _put_cached_search(cache_key, results)
         return results
 
     except requests.exceptions.ConnectionError:
         logger.warning("Databricks serving endpoint unreachable at %s", url)
-        return []
+        return None
     except requests.exceptions.HTTPError as e:
         logger.warning("Databricks serving error %s: %s", e.response.status_code, e.response.text[:200])
-        return []
+        return None
     except Exception as e:
         logger.warning("Databricks search failed: %s", e)
-        return []
+        return None
 
 
 # ---------------------------------------------------------------------------
 #  MLflow Run Metadata  (read-only, for the /mlops/status API)
 # ---------------------------------------------------------------------------
 
+# Latest-run metadata only changes when a pipeline run finishes, so the
+# dashboard is served from cache: fresh for MLFLOW_FRESH_S, then returned
+# stale (status "stale") while a background refresh runs, up to MLFLOW_STALE_S.
+MLFLOW_FRESH_S = 30.0
+MLFLOW_STALE_S = 300.0
+_mlflow_cache: Dict[str, Any] = {"ts": 0.0, "data": None, "refreshing": False}
+_mlflow_lock = threading.Lock()
+
+
 def get_mlflow_run_info() -> Optional[Dict[str, Any]]:
     """
-    Fetch the latest MLflow run metadata from the Databricks workspace.
+    Latest MLflow run metadata from the Databricks workspace.
     Returns experiment/run info for the MLOps status dashboard.
     """
     if not _is_databricks_configured():
         return None
 
+    with _mlflow_lock:
+        data = _mlflow_cache["data"]
+        age = time.monotonic() - _mlflow_cache["ts"]
+        if data is not None and age < MLFLOW_FRESH_S:
+            return copy.deepcopy(data)
+        if data is not None and age < MLFLOW_STALE_S:
+            if not _mlflow_cache["refreshing"]:
+                _mlflow_cache["refreshing"] = True
+                threading.Thread(target=_refresh_mlflow_run_info, daemon=True).start()
+            stale = copy.deepcopy(data)
+            if stale.get("status") == "ok":
+                stale["status"] = "stale"
+            return stale
+
+    return copy.deepcopy(_refresh_mlflow_run_info())
+
+
+def _refresh_mlflow_run_info() -> Dict[str, Any]:
+    data = _fetch_mlflow_run_info()  # never raises: errors come back as a status dict
+    with _mlflow_lock:
+        _mlflow_cache.update(data=data, ts=time.monotonic(), refreshing=False)
+    return data
+
+
+def _fetch_mlflow_run_info() -> Dict[str, Any]:
+    """Query the MLflow runs API for the latest vectorization run."""
     host = (DATABRICKS_HOST or "").rstrip("/")
-    headers = {
-        "Authorization": f"Bearer {DATABRICKS_TOKEN}",
-        "Content-Type": "application/json",
-    }
 
     try:
         # Search for the latest run in our experiment
-        resp = requests.post(
+        resp = _get_session().post(
             f"{host}/api/2.0/mlflow/runs/search",
             json={
                 "experiment_ids": [],
@@ -160,7 +286,6 @@ def get_mlflow_run_info() -> Optional[Dict[str, Any]]:
                 "max_results": 1,
                 "order_by": ["start_time DESC"],
             },
-            headers=headers,
             timeout=10,
         )
         resp.raise_for_status()
@@ -208,16 +333,15 @@ def get_serving_endpoint_status() -> Dict[str, Any]:
 
     host = (DATABRICKS_HOST or "").rstrip("/")
     endpoint = DATABRICKS_SERVING_ENDPOINT or "medbridge-vector-search"
-    headers = {"Authorization": f"Bearer {DATABRICKS_TOKEN}"}
 
     try:
-        resp = requests.get(
+        # Polled by the MLOps dashboard: fail fast rather than hold a pool slot
+        resp = _get_session().get(
             f"{host}/api/2.0/serving-endpoints/{endpoint}",
-            headers=headers,
-            timeout=10,
+            timeout=(1.5, 3.0),
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         state = data.get("state", {})
         return {
             "status": "ok",
@@ -5,6 +5,23 @@ Approximate lat/lng centroids for cities and regions in Ghana.
 Used by the preprocessing pipeline when no coordinates exist in the CSV.
 """
 
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz as _fuzz, process as _process
+    _RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    _RAPIDFUZZ_AVAILABLE = False
+
+class LatLng(NamedTuple):
+    lat: float
+    lng: float
+
+
 # Major Ghana cities with approximate coordinates
 # Sources: OpenStreetMap, Google Maps, Wikipedia
 GHANA_CITY_COORDS = {
@@ -354,16 +371,87 @@ GHANA_REGION_COORDS = {
     "ahafo ano south-east": (6.7500, -1.7500),
 }
 
+# Share one LatLng per distinct coordinate pair across both tables (many
+# neighbourhood aliases repeat their town's centroid)
+_COORD_INTERN = {}
+for _table in (GHANA_CITY_COORDS, GHANA_REGION_COORDS):
+    for _name, _coords in _table.items():
+        _table[_name] = _COORD_INTERN.setdefault(_coords, LatLng(*_coords))
+del _table, _name, _coords
 
+
+_HYPHEN_TO_SPACE = str.maketrans('-', ' ')
+_NORM_REPLACEMENTS = (('gt.', 'greater'), ('st.', 'saint'))
+
+
+@lru_cache(maxsize=4096)
 def _normalize_place_name(name: str) -> str:
     """Normalize a place name for robust lookup (hyphens, abbreviations, whitespace)."""
-    import re as _re
-    n = name.strip().lower()
-    n = _re.sub(r'[\s\-]+', ' ', n)          # collapse whitespace & hyphens
-    n = n.replace('gt.', 'greater').replace('st.', 'saint')
+    # collapse whitespace & hyphens
+    n = ' '.join(name.lower().translate(_HYPHEN_TO_SPACE).split())
+    if '.' in n:                             # abbreviations are rare
+        for abbr, full in _NORM_REPLACEMENTS:
+            n = n.replace(abbr, full)
     return n
 
 
+# Lookup indexes keyed by normalized name, built once at import
+_CITY_BY_NORM = {_normalize_place_name(k): v for k, v in GHANA_CITY_COORDS.items()}
+_REGION_BY_NORM = {_normalize_place_name(k): v for k, v in GHANA_REGION_COORDS.items()}
+# Stage-2 candidates, shorter (more specific) keys first
+_CITY_BY_NORM_SORTED = sorted(_CITY_BY_NORM.items(), key=lambda x: len(x[0]))
+
+# Inverted word index over the Stage-2 candidates.  A single-word query
+# matches r'\bword\b' in a key exactly when it is one of the key's \w+ runs,
+# so each bucket holds the keys containing that word, shortest first.
+_WORD_RE = re.compile(r'\w+')
+_WORD_TO_KEYS = {}
+for _key, _coords in _CITY_BY_NORM_SORTED:
+    for _word in set(_WORD_RE.findall(_key)):
+        _WORD_TO_KEYS.setdefault(_word, []).append((_key, _coords))
+del _key, _coords, _word
+
+# Stage-3 fuzzy choices, materialised once rather than per call
+_CITY_KEYS_LIST = list(_CITY_BY_NORM)
+
+
+@lru_cache(maxsize=4096)
+def _partial_city_match(city_lower: str) -> Optional[tuple]:
+    """Stages 2-3 of geocode_facility for a normalized city name.
+
+    Memoised per name: CSV ingestion repeats the same unmatched spellings,
+    and each fuzzy miss otherwise re-scores the whole key list.
+    """
+    # --- Stage 2: word-boundary partial match (safe) --------------------------
+    if _WORD_RE.fullmatch(city_lower):
+        hits = _WORD_TO_KEYS.get(city_lower)
+        if hits:
+            return hits[0][1]
+    else:
+        # Multi-word or punctuated query: scan the candidates
+        pattern = re.compile(r'\b' + re.escape(city_lower) + r'\b')
+        for key, coords in _CITY_BY_NORM_SORTED:
+            # Only accept if the query appears as a whole word in the key
+            if pattern.search(key):
+                return coords
+
+    # --- Stage 3: fuzzy Levenshtein fallback -----------------------------------
+    if _RAPIDFUZZ_AVAILABLE:
+        match = _process.extractOne(
+            city_lower,
+            _CITY_KEYS_LIST,
+            scorer=_fuzz.WRatio,
+            score_cutoff=80,
+        )
+        if match:
+            return _CITY_BY_NORM[match[0]]
+
+    return None
+
+
+# Facilities share a small set of city/region spellings, so results are
+# memoized across calls (preprocessing, region lookups in the agents)
+@lru_cache(maxsize=4096)
 def geocode_facility(city: str, region: str = None) -> tuple:
     """
     Return (latitude, longitude) for a facility based on city/region.
@@ -378,45 +466,46 @@ def geocode_facility(city: str, region: str = None) -> tuple:
       3. Fuzzy Levenshtein fallback (>= 85 similarity) via rapidfuzz if
          available, catching common misspellings like Kumase -> Kumasi.
     """
-    import re as _re
-
     # --- Stage 1: exact match -------------------------------------------------
     if city:
         city_lower = _normalize_place_name(city)
-        if city_lower in GHANA_CITY_COORDS:
-            return GHANA_CITY_COORDS[city_lower]
+        coords = _CITY_BY_NORM.get(city_lower)
+        if coords is not None:
+            return coords
 
     if region:
-        region_lower = _normalize_place_name(region)
-        if region_lower in GHANA_REGION_COORDS:
-            return GHANA_REGION_COORDS[region_lower]
-        # Try matching with normalized keys
-        for key, coords in GHANA_REGION_COORDS.items():
-            if _normalize_place_name(key) == region_lower:
-                return coords
-
-    # --- Stage 2: word-boundary partial match (safe) --------------------------
-    if city:
-        city_lower = _normalize_place_name(city)
-        # Sort candidates by key length (shorter = more specific match)
-        candidates = sorted(GHANA_CITY_COORDS.items(), key=lambda x: len(x[0]))
-        for key, coords in candidates:
-            # Only accept if the query appears as a whole word in the key
-            if _re.search(r'\b' + _re.escape(city_lower) + r'\b', key):
-                return coords
+        coords = _REGION_BY_NORM.get(_normalize_place_name(region))
+        if coords is not None:
+            return coords
 
-    # --- Stage 3: fuzzy Levenshtein fallback -----------------------------------
+    # --- Stages 2-3: partial / fuzzy city match ------------------------------
     if city:
-        try:
-            from rapidfuzz import process as rfp
-            match = rfp.extractOne(
-                _normalize_place_name(city),
-                GHANA_CITY_COORDS.keys(),
-                score_cutoff=80,
-            )
-            if match:
-                return GHANA_CITY_COORDS[match[0]]
-        except ImportError:
-            pass  # rapidfuzz not installed — skip fuzzy matching
+        coords = _partial_city_match(_normalize_place_name(city))
+        if coords is not None:
+            return coords
 
     return None, None
+
+
+def geocode_batch(
+    cities: Sequence[Optional[str]],
+    regions: Sequence[Optional[str]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Geocode parallel city/region columns in one call.
+
+    Each distinct (city, region) pair is resolved once with
+    ``geocode_facility`` and scattered back to its rows.  Returns
+    ``(latitudes, longitudes)`` as float64 arrays, NaN where unmatched.
+    """
+    pair_codes: dict = {}
+    codes = np.fromiter(
+        (pair_codes.setdefault((city or "", region or ""), len(pair_codes))
+         for city, region in zip(cities, regions)),
+        dtype=np.intp,
+    )
+    coords = np.array(
+        [geocode_facility(city, region) for city, region in pair_codes],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    return coords[codes, 0], coords[codes, 1]
@@ -0,0 +1,76 @@
+"""
+MedBridge AI — Keyword Scanners
+================================
+Precompiled keyword matchers for query parsing.  Each vocabulary is compiled
+into a single regex alternation so one linear pass over the query finds every
+keyword hit, instead of a ``for kw in keywords: if kw in ql`` loop per list.
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from backend.core.config import MEDICAL_SPECIALTIES_MAP
+
+
+class KeywordScanner:
+    """Substring matcher over a fixed ``(keyword, label)`` vocabulary.
+
+    The pattern is a zero-width lookahead alternation, longest keyword first,
+    so the longest keyword starting at every position is reported (overlapping
+    hits included).  Any other keyword starting there is a prefix of it, so
+    the full hit set is recovered by closing each reported keyword over the
+    vocabulary keywords it contains.  A keyword may carry several labels;
+    label priority is the order in which labels first appear.
+    With ``word_boundary=True`` keywords only match as whole words.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, Hashable]], word_boundary: bool = False):
+        self._labels_of: Dict[str, List[Hashable]] = {}
+        self._rank: Dict[Hashable, int] = {}
+        for kw, label in pairs:
+            self._rank.setdefault(label, len(self._rank))
+            labels = self._labels_of.setdefault(kw, [])
+            if label not in labels:
+                labels.append(label)
+        keywords = sorted(self._labels_of, key=len, reverse=True)
+        b = r"\b" if word_boundary else ""
+        self._re = re.compile(
+            "(?=" + b + "(" + "|".join(re.escape(kw) for kw in keywords) + ")" + b + ")"
+        )
+        # Vocabulary keywords guaranteed to occur wherever *kw* occurs
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            kw: tuple(
+                other for other in keywords
+                if (re.search(b + re.escape(other) + b, kw) if word_boundary else other in kw)
+            )
+            for kw in keywords
+        }
+
+    def keywords(self, text: str) -> Set[str]:
+        """Distinct vocabulary keywords occurring in ``text``."""
+        found: Set[str] = set()
+        for m in self._re.finditer(text):
+            found.update(self._implied[m.group(1)])
+        return found
+
+    def labels(self, text: str) -> List[Hashable]:
+        """Distinct labels hit in ``text``, in priority order."""
+        hits = {label for kw in self.keywords(text) for label in self._labels_of[kw]}
+        return sorted(hits, key=self._rank.__getitem__)
+
+    def first(self, text: str) -> Optional[Hashable]:
+        """Highest-priority label hit in ``text``, or None."""
+        hits = self.labels(text)
+        return hits[0] if hits else None
+
+
+def keyword_scanner(keywords: Iterable[str]) -> KeywordScanner:
+    """Scanner where every keyword is its own label (list order = priority)."""
+    return KeywordScanner((kw, kw) for kw in keywords)
+
+
+SPECIALTY_SCANNER = KeywordScanner(
+    (kw, spec_id)
+    for spec_id, keywords in MEDICAL_SPECIALTIES_MAP.items()
+    for kw in keywords
+)
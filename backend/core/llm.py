@@ -8,15 +8,26 @@ that non-technical NGO planners can understand and act on.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import mlflow
+import numpy as np
 from groq import Groq
 
-from backend.core.config import GROQ_API_KEY, GROQ_MODEL, GROQ_FALLBACK_MODEL
+from backend.core.config import (
+    EMBEDDING_DIM,
+    GROQ_API_KEY,
+    GROQ_FALLBACK_MODEL,
+    GROQ_MODEL,
+    LLM_CACHE_ENABLED,
+)
+from backend.core.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +61,8 @@ def _ensure_mlflow():
 #  GROQ CLIENT SINGLETON
 # ═══════════════════════════════════════════════════════════════════════════
 
+# One client per process, so its httpx connection pool (keep-alive + TLS
+# reuse) is shared across requests.
 _client: Optional[Groq] = None
 
 
@@ -60,12 +73,116 @@ def _get_client() -> Groq:
     return _client
 
 
+def _record_response(span, response, model: str) -> str:
+    """Extract the completion text and log it (plus token usage) on the span."""
+    content = response.choices[0].message.content or ""
+    span.set_outputs({"content": content[:500], "model_used": model})
+    # Log token usage if available
+    usage = getattr(response, "usage", None)
+    if usage:
+        span.set_attributes({
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        })
+    return content
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RESPONSE CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Completions keyed by the exact request (model, sampling params, messages).
+# Prompts are deterministic in their system text, so repeated questions
+# skip the round-trip (and the token bill).
+RESPONSE_CACHE_SIZE = 1024
+_response_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _response_key(messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> Tuple:
+    digest = hashlib.blake2b(
+        json.dumps(messages, sort_keys=True).encode("utf-8"), digest_size=16,
+    ).hexdigest()
+    return (GROQ_MODEL, temperature, max_tokens, digest)
+
+
+def _get_cached_response(key: Tuple) -> Optional[str]:
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _response_cache_lock:
+        content = _response_cache.get(key)
+        if content is not None:
+            _response_cache.move_to_end(key)
+        return content
+
+
+def _put_cached_response(key: Tuple, content: str) -> None:
+    if not LLM_CACHE_ENABLED or not content:
+        return
+    with _response_cache_lock:
+        _response_cache[key] = content
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+# Paraphrase-level cache in front of synthesis.  Query rewriting only gets
+# the exact response cache: paraphrases that differ in an entity ("... in
+# Accra" / "... in Kumasi") embed close together but need different rewrites.
+_synthesis_cache = SemanticCache(EMBEDDING_DIM, threshold=0.92)
+
+# Agent payload keys that vary per run rather than with the data: the echoed
+# query text and timings
+_SCOPE_VOLATILE_KEYS = frozenset({"query", "duration_ms", "total_duration_ms"})
+
+
+def _embed_for_cache(query: str) -> Optional[np.ndarray]:
+    """Query embedding for the semantic caches, from the shared search model."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        from backend.core.vectorstore import embed_query
+        return np.asarray(embed_query(query), dtype=np.float32)
+    except Exception as e:
+        logger.debug("Semantic cache skipped (no embedding): %s", e)
+        return None
+
+
+def _stable_payload(value: Any) -> Any:
+    """*value* with ``_SCOPE_VOLATILE_KEYS`` dropped from dicts at any depth."""
+    if isinstance(value, dict):
+        return {k: _stable_payload(v) for k, v in value.items() if k not in _SCOPE_VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_stable_payload(v) for v in value]
+    return value
+
+
+def _synthesis_scope(
+    agent_results: List[Dict[str, Any]],
+    citations: List[Dict[str, Any]],
+    intent: str,
+) -> str:
+    """Digest of the data a summary is written from (query echoes and
+    timings excluded), so paraphrased questions only share a summary of
+    identical results."""
+    stable = [(ar.get("agent"), _stable_payload(ar.get("data", {}))) for ar in agent_results]
+    payload = json.dumps([intent, len(citations or []), stable], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
 def _call_groq(
     messages: List[Dict[str, str]],
     max_tokens: int = 1024,
     temperature: float = 0.3,
 ) -> str:
-    """Call Groq chat completion with automatic fallback. Traced by MLflow."""
+    """Call Groq chat completion with automatic fallback. Traced by MLflow.
+    Identical requests are answered from the response cache."""
+    key = _response_key(messages, max_tokens, temperature)
+    cached = _get_cached_response(key)
+    if cached is not None:
+        return cached
+
     _ensure_mlflow()
     client = _get_client()
 
@@ -79,16 +196,8 @@ def _call_groq(
                     max_tokens=max_tokens,
                     temperature=temperature,
                 )
-                content = response.choices[0].message.content or ""
-                span.set_outputs({"content": content[:500], "model_used": model})
-                # Log token usage if available
-                usage = getattr(response, "usage", None)
-                if usage:
-                    span.set_attributes({
-                        "prompt_tokens": usage.prompt_tokens,
-                        "completion_tokens": usage.completion_tokens,
-                        "total_tokens": usage.total_tokens,
-                    })
+                content = _record_response(span, response, model)
+                _put_cached_response(key, content)
                 return content
         except Exception as e:
             logger.warning(f"Groq model {model} failed: {e}")
@@ -98,6 +207,54 @@ def _call_groq(
     return ""
 
 
+def _call_groq_stream(
+    messages: List[Dict[str, str]],
+    max_tokens: int = 1024,
+    temperature: float = 0.3,
+) -> Iterator[str]:
+    """Streaming ``_call_groq``: yields completion text as it is generated.
+
+    A cached completion is yielded in one piece.  The fallback model is only
+    tried if the primary one fails before producing any text.
+    """
+    key = _response_key(messages, max_tokens, temperature)
+    cached = _get_cached_response(key)
+    if cached is not None:
+        yield cached
+        return
+
+    _ensure_mlflow()
+    client = _get_client()
+
+    for model in [GROQ_MODEL, GROQ_FALLBACK_MODEL]:
+        parts: List[str] = []
+        try:
+            with mlflow.start_span(name=f"groq_llm_{model}") as span:
+                span.set_inputs({"model": model, "messages": messages, "max_tokens": max_tokens,
+                                 "temperature": temperature, "stream": True})
+                stream = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                )
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                content = "".join(parts)
+                span.set_outputs({"content": content[:500], "model_used": model})
+                _put_cached_response(key, content)
+                return
+        except Exception as e:
+            logger.warning(f"Groq model {model} failed: {e}")
+            if parts or model == GROQ_FALLBACK_MODEL:
+                logger.error("Groq stream failed" if parts else "All Groq models failed")
+                raise
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  SYSTEM PROMPTS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -177,44 +334,71 @@ def synthesize_response(
     if not GROQ_API_KEY:
         return _fallback_synthesis(agent_results)
 
-    # Build context from agent results
-    context_parts = []
-    for ar in agent_results:
-        agent = ar.get("agent", "unknown")
-        data = ar.get("data", {})
-        # Truncate large result sets to avoid token limits
-        summary = _truncate_data(data)
-        context_parts.append(f"--- {agent.upper()} AGENT ---\n{json.dumps(summary, indent=2, default=str)}")
-
-    agents_context = "\n\n".join(context_parts)
+    emb = _embed_for_cache(query)
+    if emb is not None:
+        scope = _synthesis_scope(agent_results, citations, intent)
+        cached = _synthesis_cache.lookup(emb, scope)
+        if cached is not None:
+            return cached
 
-    # Add citation count
-    citation_info = ""
-    if citations:
-        citation_info = f"\n\nCitations: {len(citations)} data points were used as evidence."
+    try:
+        result = _call_groq(
+            messages=_synthesis_messages(query, agent_results, citations, intent),
+            max_tokens=512,
+            temperature=0.3,
+        ).strip()
+        if emb is not None and result:
+            _synthesis_cache.add(emb, result, scope)
+        return result
+    except Exception as e:
+        logger.error(f"LLM synthesis failed: {e}")
+        return _fallback_synthesis(agent_results)
 
-    user_msg = f"""User Question: "{query}"
-Intent: {intent}
 
-Agent Results:
-{agents_context}
-{citation_info}
+def synthesize_response_stream(
+    query: str,
+    agent_results: List[Dict[str, Any]],
+    trace: List[Dict[str, Any]],
+    citations: List[Dict[str, Any]],
+    intent: str = "",
+) -> Iterator[str]:
+    """Streaming ``synthesize_response``: yields the summary as it is
+    generated, so a client sees the first words before the LLM finishes."""
+    if not GROQ_API_KEY:
+        yield _fallback_synthesis(agent_results)
+        return
 
-Generate a clear, actionable summary for an NGO healthcare planner. Focus on what matters for patient access and resource allocation."""
+    emb = _embed_for_cache(query)
+    if emb is not None:
+        scope = _synthesis_scope(agent_results, citations, intent)
+        cached = _synthesis_cache.lookup(emb, scope)
+        if cached is not None:
+            yield cached
+            return
 
+    parts: List[str] = []
     try:
-        result = _call_groq(
-            messages=[
-                {"role": "system", "content": SYNTHESIS_SYSTEM_PROMPT},
-                {"role": "user", "content": user_msg},
-            ],
+        for delta in _call_groq_stream(
+            messages=_synthesis_messages(query, agent_results, citations, intent),
             max_tokens=512,
             temperature=0.3,
-        )
-        return result.strip()
+        ):
+            # Leading whitespace is dropped, as synthesize_response strips it
+            if not parts:
+                delta = delta.lstrip()
+                if not delta:
+                    continue
+            parts.append(delta)
+            yield delta
     except Exception as e:
         logger.error(f"LLM synthesis failed: {e}")
-        return _fallback_synthesis(agent_results)
+        if not parts:
+            yield _fallback_synthesis(agent_results)
+        return
+
+    result = "".join(parts).strip()
+    if emb is not None and result:
+        _synthesis_cache.add(emb, result, scope)
 
 
 def classify_intent_llm(query: str) -> Optional[Dict]:
@@ -229,32 +413,11 @@ def classify_intent_llm(query: str) -> Optional[Dict]:
 
     try:
         result = _call_groq(
-            messages=[
-                {"role": "system", "content": INTENT_SYSTEM_PROMPT},
-                {"role": "user", "content": query},
-            ],
+            messages=_intent_messages(query),
             max_tokens=256,
             temperature=0.1,
         )
-
-        # Parse JSON from response
-        # Handle markdown code blocks
-        cleaned = result.strip()
-        if cleaned.startswith("```"):
-            lines = cleaned.split("\n")
-            lines = [l for l in lines if not l.strip().startswith("```")]
-            cleaned = "\n".join(lines)
-
-        parsed = json.loads(cleaned)
-
-        # Validate agent names — LLM can hallucinate names that don't exist
-        VALID_AGENTS = {"genie", "vector_search", "medical_reasoning", "geospatial", "planning"}
-        if "agents" in parsed:
-            parsed["agents"] = [a for a in parsed["agents"] if a in VALID_AGENTS]
-            if not parsed["agents"]:
-                parsed["agents"] = ["vector_search"]  # safe fallback
-
-        return parsed
+        return _parse_intent(result)
     except Exception as e:
         logger.warning(f"LLM intent classification failed: {e}")
         return None
@@ -270,27 +433,105 @@ def enhance_query(query: str) -> str:
 
     try:
         result = _call_groq(
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a query normalizer for a healthcare facility database in Ghana. "
-                        "Rewrite the user's question to be clear and specific while preserving the original meaning. "
-                        "If the query is already clear, return it unchanged. "
-                        "Keep it as a single question. Do not explain — just return the rewritten query."
-                    ),
-                },
-                {"role": "user", "content": query},
-            ],
+            messages=_enhance_messages(query),
             max_tokens=128,
             temperature=0.1,
         )
-        enhanced = result.strip().strip('"').strip("'")
-        return enhanced if enhanced else query
+        return _clean_enhanced(result, query)
     except Exception:
         return query
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+#  PROMPT BUILDING / RESPONSE PARSING
+# ═══════════════════════════════════════════════════════════════════════════
+
+ENHANCE_SYSTEM_PROMPT = (
+    "You are a query normalizer for a healthcare facility database in Ghana. "
+    "Rewrite the user's question to be clear and specific while preserving the original meaning. "
+    "If the query is already clear, return it unchanged. "
+    "Keep it as a single question. Do not explain — just return the rewritten query."
+)
+
+VALID_AGENTS = {"genie", "vector_search", "medical_reasoning", "geospatial", "planning"}
+
+
+def _synthesis_messages(
+    query: str,
+    agent_results: List[Dict[str, Any]],
+    citations: List[Dict[str, Any]],
+    intent: str,
+) -> List[Dict[str, str]]:
+    # Build context from agent results
+    context_parts = []
+    for ar in agent_results:
+        agent = ar.get("agent", "unknown")
+        data = ar.get("data", {})
+        # Truncate large result sets to avoid token limits
+        summary = _truncate_data(data)
+        context_parts.append(f"--- {agent.upper()} AGENT ---\n{json.dumps(summary, indent=2, default=str)}")
+
+    agents_context = "\n\n".join(context_parts)
+
+    # Add citation count
+    citation_info = ""
+    if citations:
+        citation_info = f"\n\nCitations: {len(citations)} data points were used as evidence."
+
+    user_msg = f"""User Question: "{query}"
+Intent: {intent}
+
+Agent Results:
+{agents_context}
+{citation_info}
+
+Generate a clear, actionable summary for an NGO healthcare planner. Focus on what matters for patient access and resource allocation."""
+
+    return [
+        {"role": "system", "content": SYNTHESIS_SYSTEM_PROMPT},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+def _intent_messages(query: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": INTENT_SYSTEM_PROMPT},
+        {"role": "user", "content": query},
+    ]
+
+
+def _parse_intent(result: str) -> Dict:
+    # Parse JSON from response
+    # Handle markdown code blocks
+    cleaned = result.strip()
+    if cleaned.startswith("```"):
+        lines = cleaned.split("\n")
+        lines = [l for l in lines if not l.strip().startswith("```")]
+        cleaned = "\n".join(lines)
+
+    parsed = json.loads(cleaned)
+
+    # Validate agent names — LLM can hallucinate names that don't exist
+    if "agents" in parsed:
+        parsed["agents"] = [a for a in parsed["agents"] if a in VALID_AGENTS]
+        if not parsed["agents"]:
+            parsed["agents"] = ["vector_search"]  # safe fallback
+
+    return parsed
+
+
+def _enhance_messages(query: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": ENHANCE_SYSTEM_PROMPT},
+        {"role": "user", "content": query},
+    ]
+
+
+def _clean_enhanced(result: str, query: str) -> str:
+    enhanced = result.strip().strip('"').strip("'")
+    return enhanced if enhanced else query
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  HELPERS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -308,22 +549,20 @@ def _truncate_data(data: dict, max_items: int = 10, max_total_chars: int = 6000)
         if remaining <= 0:
             break
         if isinstance(value, list):
-            serialized = json.dumps(value[:max_items], default=str)
-            if len(serialized) > remaining:
-                # Binary-search for the largest slice that fits
-                lo, hi = 0, min(len(value), max_items)
-                while lo < hi:
-                    mid = (lo + hi + 1) // 2
-                    if len(json.dumps(value[:mid], default=str)) <= remaining:
-                        lo = mid
-                    else:
-                        hi = mid - 1
-                value = value[:lo]
-                serialized = json.dumps(value, default=str)
+            # Each item is serialized once; json.dumps(value[:k]) is then
+            # "[" + items joined by ", " + "]", so every prefix length is a
+            # running sum and the largest slice that fits is found in one pass.
+            size, kept = 2, 0
+            for item in value[:max_items]:
+                grown = size + len(json.dumps(item, default=str)) + (2 if kept else 0)
+                if grown > remaining:
+                    break
+                size, kept = grown, kept + 1
+            value = value[:kept]
             truncated[key] = value
             if len(value) < len(data.get(key, [])):
                 truncated[f"_{key}_note"] = f"Showing {len(value)} of {len(data[key])} total"
-            remaining -= len(serialized)
+            remaining -= size
         elif isinstance(value, dict) and len(str(value)) > remaining:
             truncated[key] = {k: v for i, (k, v) in enumerate(value.items()) if i < 10}
             truncated[f"_{key}_note"] = "Truncated for brevity"
@@ -8,14 +8,31 @@ composite text document per facility/NGO for downstream embedding.
 
 import ast
 import json
+import pickle
 import re
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from backend.core.config import CSV_PATH
-from backend.core.geocoding import geocode_facility
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401  (enables the multithreaded CSV reader)
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
+from backend.core import geocoding
+from backend.core.config import CACHE_DIR, CSV_PATH
+from backend.core.geocoding import geocode_batch
 
 # ── Columns that store JSON-encoded lists ────────────────────────────────────
 JSON_LIST_COLS = [
@@ -40,46 +57,97 @@ METADATA_COLS = [
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _safe_parse_json_list(value: Any) -> List[str]:
-    if pd.isna(value) or value is None:
-        return []
+def _json_loads(s: str) -> Any:
+    """Decode JSON with orjson when available (stdlib for what it rejects,
+    e.g. NaN literals)."""
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s)
+
+
+def _safe_parse_json_list(value: Any, python_repr: bool = False) -> List[str]:
+    """Parse a list-valued cell.  JSON is tried first, then Python-repr
+    (``"['a', 'b']"``); ``python_repr=True`` swaps the order for columns
+    sniffed as repr-encoded (see ``_sniff_python_repr``)."""
     if isinstance(value, list):
         return value
+    if value is None or pd.isna(value):
+        return []
     s = str(value).strip()
     if s in ("", "null", "[]", "None"):
         return []
-    try:
-        parsed = json.loads(s)
-        if isinstance(parsed, list):
-            return [str(item) for item in parsed if item is not None]
-        return [str(parsed)]
-    except (json.JSONDecodeError, ValueError):
-        pass
-    try:
-        parsed = ast.literal_eval(s)
+    for decode in ((ast.literal_eval, _json_loads) if python_repr else (_json_loads, ast.literal_eval)):
+        try:
+            parsed = decode(s)
+        except (ValueError, SyntaxError):
+            continue
         if isinstance(parsed, list):
             return [str(item) for item in parsed if item is not None]
         return [str(parsed)]
-    except (ValueError, SyntaxError):
-        pass
     return [s]
 
 
+def _sniff_python_repr(values: np.ndarray, sample_size: int = 50) -> bool:
+    """True when (nearly) every sampled list cell fails as JSON, i.e. the
+    column holds Python-repr lists and should be parsed with that first."""
+    sample = []
+    for v in values:
+        if isinstance(v, str) and v.startswith("[") and v != "[]":
+            sample.append(v)
+            if len(sample) == sample_size:
+                break
+    if not sample:
+        return False
+    failures = 0
+    for s in sample:
+        try:
+            _json_loads(s)
+        except ValueError:
+            failures += 1
+    return failures >= 0.9 * len(sample)
+
+
+_CAMEL_RE = re.compile(r"([a-z])([A-Z])")
+
+
+@lru_cache(maxsize=2048)
 def _camel_to_readable(name: str) -> str:
-    spaced = re.sub(r"([a-z])([A-Z])", r"\1 \2", name)
+    spaced = _CAMEL_RE.sub(r"\1 \2", name)
     return spaced.replace("And", "and").title()
 
 
+_EMPTY_TOKENS = ("", "null", "None", "[]")
+
+
 def _non_empty(value: Any) -> bool:
     if value is None or (isinstance(value, float) and pd.isna(value)):
         return False
-    if isinstance(value, str) and value.strip() in ("", "null", "None", "[]"):
+    if isinstance(value, str) and value.strip() in _EMPTY_TOKENS:
         return False
     return True
 
 
-def _richness_score(row: pd.Series) -> int:
-    return sum(1 for col in row.index if _non_empty(row[col]))
+def _non_empty_mask(df: pd.DataFrame) -> pd.DataFrame:
+    """Column-wise ``_non_empty`` over a whole frame.
+
+    Text columns (``str`` dtype, NaN for missing) are checked with
+    vectorized ``.str`` ops and numpy numeric ones with ``notna``; anything
+    else (parsed lists, mixed objects, pd.NA-backed dtypes) keeps the
+    per-cell check.
+    """
+    mask = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.StringDtype) and s.dtype.na_value is not pd.NA:
+            mask[col] = s.notna() & ~s.str.strip().isin(_EMPTY_TOKENS).astype(bool)
+        elif isinstance(s.dtype, np.dtype) and s.dtype.kind in "fiub":
+            mask[col] = s.notna()
+        else:
+            mask[col] = pd.Series([_non_empty(v) for v in s], index=df.index, dtype=bool)
+    return pd.DataFrame(mask, index=df.index)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -87,141 +155,205 @@ def _richness_score(row: pd.Series) -> int:
 # ─────────────────────────────────────────────────────────────────────────────
 
 def load_raw_data(csv_path: Path = CSV_PATH) -> pd.DataFrame:
-    df = pd.read_csv(csv_path, dtype=str)
+    # Arrow's reader parses in parallel; columns stay plain ``str`` (NaN for
+    # missing) either way, so the cleaning steps below see the same data
+    engine = "pyarrow" if _PYARROW_AVAILABLE else "c"
+    df = pd.read_csv(csv_path, dtype=str, engine=engine)
     print(f"  Loaded {len(df)} rows x {len(df.columns)} columns from {csv_path.name}")
     return df
 
 
 def clean_and_parse(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    """Strip, null-normalize and parse list columns (modifies ``df`` in place)."""
     df.columns = df.columns.str.strip()
     str_cols = df.select_dtypes(include=["object", "string"]).columns
     for col in str_cols:
-        df[col] = df[col].map(lambda x: x.strip() if isinstance(x, str) else x)
+        if isinstance(df[col].dtype, pd.StringDtype):
+            df[col] = df[col].str.strip()
+        else:
+            df[col] = df[col].map(lambda x: x.strip() if isinstance(x, str) else x)
     df.replace({"null": pd.NA, "None": pd.NA, "": pd.NA}, inplace=True)
     for col in JSON_LIST_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(_safe_parse_json_list)
+            values = df[col].to_numpy()
+            python_repr = _sniff_python_repr(values)
+            df[col] = pd.Series(
+                [_safe_parse_json_list(v, python_repr) for v in values], index=df.index, dtype=object,
+            )
     if "facilityTypeId" in df.columns:
         df["facilityTypeId"] = df["facilityTypeId"].replace({"farmacy": "pharmacy"})
     return df
 
 
 def deduplicate(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["_richness"] = df.apply(_richness_score, axis=1)
+    """Merge rows sharing a pk_unique_id (sorts and annotates ``df`` in place)."""
+    mask = _non_empty_mask(df)
+    df["_richness"] = mask.sum(axis=1)
     df.sort_values("_richness", ascending=False, inplace=True)
-    grouped = df.groupby("pk_unique_id", sort=False)
-    merged_rows: List[Dict] = []
-    for pk, group in grouped:
-        base = group.iloc[0].to_dict()
-        for col in JSON_LIST_COLS:
-            if col in df.columns:
-                combined, seen = [], set()
-                for _, row in group.iterrows():
-                    for item in row[col]:
-                        if item not in seen:
-                            seen.add(item)
-                            combined.append(item)
-                base[col] = combined
-        for col in df.columns:
-            if col in JSON_LIST_COLS or col == "_richness":
-                continue
-            if not _non_empty(base.get(col)):
-                for _, row in group.iterrows():
-                    if _non_empty(row[col]):
-                        base[col] = row[col]
-                        break
-        merged_rows.append(base)
-    result = pd.DataFrame(merged_rows)
-    result.drop(columns=["_richness"], inplace=True, errors="ignore")
-    print(f"  Deduplicated: {len(df)} rows -> {len(result)} unique facilities/NGOs")
+    mask = mask.loc[df.index]
+
+    # Group rows (richest first) without iterating group frames: each merged
+    # field is picked by row position, so values keep their original dtype.
+    n_input = len(df)
+    group_ids = df.groupby("pk_unique_id", sort=False).ngroup()
+    if group_ids.isna().any():  # rows without a pk_unique_id are dropped, as groupby does
+        keep = group_ids.notna().to_numpy()
+        df, mask, group_ids = df[keep], mask[keep], group_ids[keep]
+    codes = group_ids.to_numpy(dtype=np.intp)
+    n_rows, n_groups = len(df), int(codes.max()) + 1 if len(df) else 0
+    members: List[List[int]] = [[] for _ in range(n_groups)]
+    for pos, g in enumerate(codes):
+        members[g].append(pos)
+    base_pos = np.array([rows[0] for rows in members], dtype=np.intp)
+
+    merged: Dict[str, Any] = {}
+    for col in df.columns:
+        if col == "_richness":
+            continue
+        if col in JSON_LIST_COLS:
+            # Ordered union of the group's lists (most groups are one row,
+            # which skips the generator/chain setup)
+            values = df[col].tolist()
+            merged[col] = pd.Series(
+                [
+                    list(dict.fromkeys(values[rows[0]])) if len(rows) == 1
+                    else list(dict.fromkeys(chain.from_iterable(values[p] for p in rows)))
+                    for rows in members
+                ],
+                dtype=object,
+            )
+        else:
+            # Richest row's value, or the first non-empty one in the group
+            candidate = np.where(mask[col].to_numpy(), np.arange(n_rows), n_rows)
+            first = np.full(n_groups, n_rows, dtype=np.intp)
+            np.minimum.at(first, codes, candidate)
+            pick = np.where(first < n_rows, first, base_pos)
+            merged[col] = df[col].take(pick).reset_index(drop=True)
+    # Columns are freshly built arrays: adopt them rather than copying again
+    result = pd.DataFrame(merged, copy=False)
+    print(f"  Deduplicated: {n_input} rows -> {len(result)} unique facilities/NGOs")
     return result
 
 
+LOCATION_COLS = ["address_line1", "address_line2", "address_city", "address_stateOrRegion", "address_country"]
+
+# (document label, column, separator) for list-valued sections
+_LIST_SECTIONS = [
+    ("Medical Specialties", "specialties", ", "),
+    ("Procedures", "procedure", "; "),
+    ("Equipment", "equipment", "; "),
+    ("Capabilities", "capability", "; "),
+]
+
+# (document label, column) for scalar sections, emitted only when non-empty
+_SCALAR_SECTIONS = [(col, col) for col in FREE_TEXT_COLS] + [
+    ("Operator", "operatorTypeId"),
+    ("Number of Doctors", "numberDoctors"),
+    ("Bed Capacity", "capacity"),
+    ("Year Established", "yearEstablished"),
+]
+
+_META_LIST_COLS = ["specialties", "procedure", "equipment", "capability", "affiliationTypeIds"]
+
+
+def _column(df: pd.DataFrame, col: str, default: Any = None) -> List[Any]:
+    """Column values as a plain list (``default`` per row if it is absent)."""
+    return df[col].tolist() if col in df.columns else [default] * len(df)
+
+
+def _meta_value(val: Any) -> Any:
+    return val if not isinstance(val, float) else (int(val) if val == int(val) else val)
+
+
+def _build_chunk(df: pd.DataFrame) -> Tuple[List[str], List[Dict]]:
+    """Documents and geocoded metadata for every row of ``df``."""
+    # Emptiness of every checked column, computed once up front (several
+    # feed both the document text and the metadata)
+    checked = dict.fromkeys(["facilityTypeId", *LOCATION_COLS, *(c for _, c in _SCALAR_SECTIONS), *METADATA_COLS])
+    present = {col: [_non_empty(v) for v in _column(df, col)] for col in checked}
+
+    # Each document section is built for the whole column at once (None where
+    # a row omits it), then rows are stitched together in a single pass.
+    sections: List[List[Optional[str]]] = [
+        [f"Name: {name}" for name in _column(df, "name", "Unknown Facility")],
+        [
+            f"Type: {org_type}" + (f" ({facility_type})" if ok else "")
+            for org_type, facility_type, ok in zip(
+                _column(df, "organization_type", "facility"), _column(df, "facilityTypeId", ""),
+                present["facilityTypeId"],
+            )
+        ],
+    ]
+
+    location: List[Optional[str]] = []
+    for values, oks in zip(
+        zip(*(_column(df, col) for col in LOCATION_COLS)),
+        zip(*(present[col] for col in LOCATION_COLS)),
+    ):
+        loc_parts = [str(v) for v, ok in zip(values, oks) if ok]
+        location.append(f"Location: {', '.join(loc_parts)}" if loc_parts else None)
+    sections.append(location)
+
+    for label, col, sep in _LIST_SECTIONS:
+        items = _column(df, col, [])
+        if col == "specialties":
+            items = [[_camel_to_readable(s) for s in specs] if specs else specs for specs in items]
+        sections.append([f"{label}: {sep.join(xs)}" if xs else None for xs in items])
+
+    for label, col in _SCALAR_SECTIONS:
+        sections.append([
+            f"{label}: {v}" if ok else None
+            for v, ok in zip(_column(df, col), present[col])
+        ])
+
+    documents = ["\n".join([p for p in parts if p is not None]) for parts in zip(*sections)]
+
+    meta_keys = METADATA_COLS + _META_LIST_COLS
+    meta_columns = [
+        [_meta_value(v) if ok else None for v, ok in zip(_column(df, col), present[col])]
+        for col in METADATA_COLS
+    ]
+    meta_columns += [_column(df, col, []) for col in _META_LIST_COLS]
+    metadata_list: List[Dict] = [dict(zip(meta_keys, values)) for values in zip(*meta_columns)]
+
+    # ── Geocode: enrich with lat/lng from city/region lookup ──
+    missing = [m for m in metadata_list if m.get("latitude") is None or m.get("longitude") is None]
+    lats, lngs = geocode_batch(
+        [m.get("address_city") for m in missing],
+        [m.get("address_stateOrRegion") for m in missing],
+    )
+    for meta, lat, lng in zip(missing, lats.tolist(), lngs.tolist()):
+        if not (np.isnan(lat) or np.isnan(lng)):
+            meta["latitude"] = lat
+            meta["longitude"] = lng
+
+    return documents, metadata_list
+
+
+def iter_documents(df: pd.DataFrame, chunk_size: int = 1024) -> Iterator[Tuple[str, Dict]]:
+    """Yield ``(document, metadata)`` per row, lazily.
+
+    Rows are built column-wise one chunk at a time, so only ``chunk_size``
+    documents are held at once; consumers that embed or index row by row
+    never need the full set in memory.
+    """
+    for start in range(0, len(df), chunk_size):
+        documents, metadata_list = _build_chunk(df.iloc[start:start + chunk_size])
+        yield from zip(documents, metadata_list)
+
+
 def build_documents(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the ``document`` and ``metadata`` columns (modifies ``df`` in place)."""
     documents: List[str] = []
     metadata_list: List[Dict] = []
-
-    for _, row in df.iterrows():
-        parts: List[str] = []
-        name = row.get("name", "Unknown Facility")
-        org_type = row.get("organization_type", "facility")
-        facility_type = row.get("facilityTypeId", "")
-        parts.append(f"Name: {name}")
-        parts.append(f"Type: {org_type}" + (f" ({facility_type})" if _non_empty(facility_type) else ""))
-
-        loc_parts = []
-        for col in ["address_line1", "address_line2", "address_city", "address_stateOrRegion", "address_country"]:
-            v = row.get(col)
-            if _non_empty(v):
-                loc_parts.append(str(v))
-        if loc_parts:
-            parts.append(f"Location: {', '.join(loc_parts)}")
-
-        specs = row.get("specialties", [])
-        if specs:
-            readable = [_camel_to_readable(s) for s in specs]
-            parts.append(f"Medical Specialties: {', '.join(readable)}")
-
-        procs = row.get("procedure", [])
-        if procs:
-            parts.append(f"Procedures: {'; '.join(procs)}")
-
-        equip = row.get("equipment", [])
-        if equip:
-            parts.append(f"Equipment: {'; '.join(equip)}")
-
-        caps = row.get("capability", [])
-        if caps:
-            parts.append(f"Capabilities: {'; '.join(caps)}")
-
-        for col in FREE_TEXT_COLS:
-            val = row.get(col)
-            if _non_empty(val):
-                parts.append(f"{col}: {val}")
-
-        if _non_empty(row.get("operatorTypeId")):
-            parts.append(f"Operator: {row['operatorTypeId']}")
-        if _non_empty(row.get("numberDoctors")):
-            parts.append(f"Number of Doctors: {row['numberDoctors']}")
-        if _non_empty(row.get("capacity")):
-            parts.append(f"Bed Capacity: {row['capacity']}")
-        if _non_empty(row.get("yearEstablished")):
-            parts.append(f"Year Established: {row['yearEstablished']}")
-
-        doc_text = "\n".join(parts)
+    for doc_text, meta in iter_documents(df):
         documents.append(doc_text)
-
-        meta: Dict[str, Any] = {}
-        for col in METADATA_COLS:
-            val = row.get(col)
-            if _non_empty(val):
-                meta[col] = val if not isinstance(val, float) else (int(val) if val == int(val) else val)
-            else:
-                meta[col] = None
-        meta["specialties"] = row.get("specialties", [])
-        meta["procedure"] = row.get("procedure", [])
-        meta["equipment"] = row.get("equipment", [])
-        meta["capability"] = row.get("capability", [])
-        meta["affiliationTypeIds"] = row.get("affiliationTypeIds", [])
-
-        # ── Geocode: enrich with lat/lng from city/region lookup ──
-        if meta.get("latitude") is None or meta.get("longitude") is None:
-            city = meta.get("address_city") or ""
-            region = meta.get("address_stateOrRegion") or ""
-            lat, lng = geocode_facility(city, region)
-            if lat is not None and lng is not None:
-                meta["latitude"] = lat
-                meta["longitude"] = lng
-
         metadata_list.append(meta)
 
-    df = df.copy()
     df["document"] = documents
     df["metadata"] = metadata_list
     geocoded = sum(1 for m in metadata_list if m.get("latitude") is not None)
-    print(f"  Built {len(documents)} documents (avg {sum(len(d) for d in documents) // len(documents)} chars)")
+    print(f"  Built {len(documents)} documents (avg {sum(len(d) for d in documents) // max(len(documents), 1)} chars)")
     print(f"  Geocoded: {geocoded}/{len(metadata_list)} facilities have coordinates")
     return df
 
@@ -229,18 +361,74 @@ def build_documents(df: pd.DataFrame) -> pd.DataFrame:
 # ── Singleton cache so preprocessing only runs once ──────────────────────────
 _preprocessing_cache: Optional[pd.DataFrame] = None
 
+# Pickled result, reused across restarts while its sources are unchanged.
+# Bump the version when the output schema changes.
+_DISK_CACHE = CACHE_DIR / "preprocessed_df.pkl"
+_DISK_CACHE_VERSION = 1
+
+
+def _disk_cache_key(csv_path: Path) -> Tuple:
+    """Invalidate on any change to the CSV or the code that shapes the output."""
+    key: List[Any] = [_DISK_CACHE_VERSION, str(Path(csv_path).resolve())]
+    for path in (csv_path, __file__, geocoding.__file__):
+        try:
+            st = Path(path).stat()
+        except OSError:
+            return ()
+        key.append((st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+
+def _load_disk_cache(csv_path: Path) -> Optional[pd.DataFrame]:
+    key = _disk_cache_key(csv_path)
+    if not key or not _DISK_CACHE.exists():
+        return None
+    try:
+        with open(_DISK_CACHE, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    if cached.get("key") != key:
+        return None
+    return cached["df"]
+
+
+def _save_disk_cache(csv_path: Path, df: pd.DataFrame):
+    # Pickle rather than Parquet: the list and metadata-dict columns come
+    # back as the same Python objects instead of Arrow arrays/structs.
+    key = _disk_cache_key(csv_path)
+    if not key:
+        return
+    try:
+        _DISK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _DISK_CACHE.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "df": df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(_DISK_CACHE)
+    except OSError:
+        pass  # cache is best-effort (e.g. read-only deployment)
+
 
 def run_preprocessing(csv_path: Path = CSV_PATH) -> pd.DataFrame:
     global _preprocessing_cache
     if _preprocessing_cache is not None:
         return _preprocessing_cache.copy()
 
+    df = _load_disk_cache(csv_path)
+    if df is not None:
+        print(f"--- Preprocessed data loaded from {_DISK_CACHE.name} ({len(df)} facilities) ---\n")
+        _preprocessing_cache = df
+        return df.copy()
+
     print("--- Data Preprocessing Pipeline ---")
+    # The stages work in place on the freshly loaded frame; callers only
+    # ever get copies of the cached result
     df = load_raw_data(csv_path)
     df = clean_and_parse(df)
     df = deduplicate(df)
     df = build_documents(df)
     print("--- Preprocessing complete ---\n")
 
+    _save_disk_cache(csv_path, df)
     _preprocessing_cache = df
     return df.copy()
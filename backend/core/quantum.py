@@ -30,8 +30,11 @@ Usage:
 
 from __future__ import annotations
 
+import math
 import time
 import logging
+from functools import lru_cache
+from itertools import chain, permutations
 from typing import Dict, List, Optional
 
 import numpy as np
@@ -42,9 +45,9 @@ logger = logging.getLogger(__name__)
 # 4 cities = 16 qubits (65K states) → ~2 s, tiny RAM
 # 5 cities = 25 qubits (33M states) → OOM on most machines
 # For the exact eigensolver, 4 is the safe maximum.
-# For 5-10 cities, we brute-force all n! permutations (10! = 3.6M, ~1 s).
+# For 5-10 cities, we brute-force every distinct cycle ((n-1)!/2, 181K at n=10).
 MAX_CITIES_EXACT = 4   # NumPyMinimumEigensolver (guaranteed optimal)
-MAX_CITIES_BRUTE = 10  # brute-force all n! permutations
+MAX_CITIES_BRUTE = 10  # brute-force all distinct tours
 
 
 def is_qiskit_available() -> bool:
@@ -57,6 +60,166 @@ def is_qiskit_available() -> bool:
         return False
 
 
+def _tsp_objective(dist_matrix: np.ndarray) -> np.ndarray:
+    """Distance term of the TSP QUBO as an ``(n², n²)`` matrix.
+
+    Variable ``x[i*n + k]`` means "city i at tour position k"; the term
+    ``w_ij * x[i, k] * x[j, k+1]`` charges every consecutive pair, i.e.
+    ``kron(W, S)`` with ``S`` the cyclic next-position shift.  Weights are
+    the symmetrised upper triangle, as in qiskit's ``Tsp`` application (the
+    one-hot constraints are added as linear equalities by the caller).
+    """
+    n = dist_matrix.shape[0]
+    upper = np.triu(np.asarray(dist_matrix, dtype=np.float64), 1)
+    shift = np.roll(np.eye(n), 1, axis=1)
+    return np.kron(upper + upper.T, shift)
+
+
+def _decode_tour(x: np.ndarray, n: int) -> List[int]:
+    """City at each tour position from a QUBO bit vector (-1 where a
+    position holds no city or several)."""
+    grid = np.asarray(x).reshape(n, n) > 0.5  # [city, position]
+    return [int(col.argmax()) if col.sum() == 1 else -1 for col in grid.T]
+
+
+def _cyclic_cost(dist_matrix: np.ndarray, tour: List[int]) -> float:
+    """Length of ``tour`` including the closing edge back to its start."""
+    t = np.asarray(tour, dtype=np.intp)
+    return float(dist_matrix[t, np.roll(t, -1)].sum())
+
+
+_heap_search_jit = None
+
+
+def _heap_search(dist_matrix, symmetric):
+    """
+    Brute-force TSP over the tours starting at city 0, generated by Heap's
+    algorithm over positions 1..n-1 (each order is reached from the last by
+    a single swap).  The running tour cost is updated from the (at most
+    four) edges around the swapped positions instead of re-summing n edges.
+    With ``symmetric`` only one direction of each cycle is considered
+    (``tour[1] < tour[-1]``).  Near-best candidates are re-scored exactly
+    (edges summed in tour order, ties broken lexicographically) so the
+    result matches the NumPy path; that also resets any drift in the
+    running cost.  Compiled with numba by :func:`_heap_kernel`.
+    """
+    n = dist_matrix.shape[0]
+    perm = np.arange(n)
+    best = perm.copy()
+    best_cost = 0.0
+    for k in range(n):
+        best_cost += dist_matrix[perm[k], perm[(k + 1) % n]]
+    cost = best_cost
+    tol = 1e-9 * (np.abs(dist_matrix).max() * n + 1.0)
+    touched = np.empty(4, dtype=np.int64)
+    counters = np.zeros(n, dtype=np.int64)
+    i = 1
+    while i < n - 1:
+        if counters[i] < i:
+            # Swap positions pa < pb (city 0 stays at position 0)
+            pa = 1 + (0 if i % 2 == 0 else counters[i])
+            pb = 1 + i
+            # Edges (by start position) that touch positions pa or pb
+            m = 0
+            for e in (pa - 1, pa, pb - 1, pb):
+                seen = False
+                for j in range(m):
+                    if touched[j] == e:
+                        seen = True
+                if not seen:
+                    touched[m] = e
+                    m += 1
+            for j in range(m):
+                e = touched[j]
+                cost -= dist_matrix[perm[e], perm[(e + 1) % n]]
+            perm[pa], perm[pb] = perm[pb], perm[pa]
+            for j in range(m):
+                e = touched[j]
+                cost += dist_matrix[perm[e], perm[(e + 1) % n]]
+
+            if (not symmetric or perm[1] < perm[n - 1]) and cost <= best_cost + tol:
+                exact = 0.0
+                for k in range(n):
+                    exact += dist_matrix[perm[k], perm[(k + 1) % n]]
+                better = exact < best_cost
+                if exact == best_cost:
+                    for k in range(n):
+                        if perm[k] != best[k]:
+                            better = perm[k] < best[k]
+                            break
+                if better:
+                    best_cost = exact
+                    best[:] = perm
+                cost = exact
+            counters[i] += 1
+            i = 1
+        else:
+            counters[i] = 0
+            i += 1
+    return best
+
+
+def _heap_kernel():
+    """Return the numba-compiled :func:`_heap_search`, or None without numba.
+
+    No fastmath: tours are compared for exact cost ties, so sums must match
+    the NumPy path bit for bit.
+    """
+    global _heap_search_jit
+    if _heap_search_jit is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _heap_search_jit = False
+        else:
+            _heap_search_jit = njit(cache=True)(_heap_search)
+    return _heap_search_jit or None
+
+
+@lru_cache(maxsize=16)
+def _perm_array(n: int, symmetric: bool) -> np.ndarray:
+    """Candidate tours as a read-only int8 array, in lexicographic order.
+
+    Rotations of a cycle cost the same, so only tours starting at city 0
+    are listed ((n-1)! of them); with a symmetric matrix a cycle and its
+    reverse do too, so only ``tour[1] < tour[-1]`` is kept ((n-1)!/2).
+    Built once per city count.
+    """
+    rest = np.fromiter(
+        chain.from_iterable(permutations(range(1, n))),
+        dtype=np.int8,
+        count=math.factorial(n - 1) * (n - 1),
+    ).reshape(-1, n - 1)
+    if symmetric and n > 2:
+        rest = rest[rest[:, 0] < rest[:, -1]]
+    perms = np.hstack((np.zeros((len(rest), 1), dtype=np.int8), rest))
+    perms.setflags(write=False)
+    return perms
+
+
+def _brute_force_tour(dist_matrix: np.ndarray) -> List[int]:
+    """Shortest cyclic tour, starting at city 0 (first one in lexicographic
+    order on ties).  Only one rotation, and for a symmetric matrix one
+    direction, of each cycle is scored: (n-1)!/2 tours instead of n!.
+
+    Uses the numba Heap's-algorithm search when numba is installed.
+    Otherwise every candidate is a row of an index array, and all tour
+    costs are accumulated together one edge position at a time, in the
+    same order as a per-tour sum.
+    """
+    symmetric = bool(np.array_equal(dist_matrix, dist_matrix.T))
+    kernel = _heap_kernel()
+    if kernel is not None:
+        return kernel(np.ascontiguousarray(dist_matrix, dtype=np.float64), symmetric).tolist()
+
+    n = dist_matrix.shape[0]
+    perms = _perm_array(n, symmetric)
+    costs = np.zeros(len(perms))
+    for i in range(n):
+        costs += dist_matrix[perms[:, i], perms[:, (i + 1) % n]]
+    return perms[int(costs.argmin())].tolist()
+
+
 def solve_tsp_qubo(
     dist_matrix: np.ndarray,
     *,
@@ -69,7 +232,7 @@ def solve_tsp_qubo(
       - n <= MAX_CITIES_EXACT (4): Qiskit NumPyMinimumEigensolver on the
         full QUBO Hamiltonian.  Exact ground state = what a perfect quantum
         computer would return.
-      - 5 <= n <= MAX_CITIES_BRUTE (10): Brute-force all n! permutations,
+      - 5 <= n <= MAX_CITIES_BRUTE (10): Brute-force all distinct tours,
         scored against the QUBO objective from Qiskit.  Still uses the
         quantum QUBO formulation — just evaluated classically.
 
@@ -97,10 +260,11 @@ def solve_tsp_qubo(
         }
 
     if n < 3:
+        # 0-2 cities: the only tour there is (2 cities = out and back)
         tour = list(range(n))
         return {
             "tour": tour,
-            "cost_km": float(dist_matrix[0, 1]) if n == 2 else 0.0,
+            "cost_km": round(_cyclic_cost(dist_matrix, tour), 1),
             "method": "trivial",
             "feasible": True,
             "n_qubits": 0,
@@ -108,70 +272,51 @@ def solve_tsp_qubo(
             "city_labels": [city_names[i] for i in tour] if city_names else tour,
         }
 
-    # ── Lazy imports ─────────────────────────────────────────────────────
-    try:
-        import networkx as nx
-        from qiskit_optimization.applications import Tsp
-    except ImportError as exc:
-        return {
-            "error": f"Qiskit packages not installed: {exc}",
-            "feasible": False,
-            "method": "qubo_import_error",
-        }
+    n_qubits = n * n  # one binary variable per (city, tour position)
+    logger.info("QUBO TSP: %d cities -> %d binary variables", n, n_qubits)
 
-    try:
-        # ── 1. Build TSP graph with real distances ───────────────────────
-        G = nx.complete_graph(n)
-        for i in range(n):
-            for j in range(i + 1, n):
-                w = float(dist_matrix[i, j])
-                G[i][j]["weight"] = w
-                G[j][i]["weight"] = w
-
-        tsp = Tsp(G)
-        qp = tsp.to_quadratic_program()
-        n_qubits = qp.get_num_vars()  # n^2
-
-        logger.info("QUBO TSP: %d cities -> %d binary variables", n, n_qubits)
+    # ── Lazy imports (only the exact eigensolver needs Qiskit) ───────────
+    if n <= MAX_CITIES_EXACT:
+        try:
+            from qiskit_algorithms import NumPyMinimumEigensolver
+            from qiskit_optimization import QuadraticProgram
+            from qiskit_optimization.algorithms import MinimumEigenOptimizer
+        except ImportError as exc:
+            return {
+                "error": f"Qiskit packages not installed: {exc}",
+                "feasible": False,
+                "method": "qubo_import_error",
+            }
 
-        # ── 2. Solve ─────────────────────────────────────────────────────
+    try:
+        # ── Solve ────────────────────────────────────────────────────────
         if n <= MAX_CITIES_EXACT:
             # Strategy A: exact eigensolver (fast for n<=4)
-            from qiskit_optimization.algorithms import MinimumEigenOptimizer
-            from qiskit_algorithms import NumPyMinimumEigensolver
-
-            exact_solver = NumPyMinimumEigensolver()
-            optimizer = MinimumEigenOptimizer(exact_solver)
+            qp = QuadraticProgram(name="TSP")
+            for i in range(n):
+                for k in range(n):
+                    qp.binary_var(name=f"x_{i}_{k}")
+            qp.minimize(quadratic=_tsp_objective(dist_matrix))
+            for i in range(n):
+                qp.linear_constraint(linear={f"x_{i}_{k}": 1 for k in range(n)}, sense="==", rhs=1)
+            for k in range(n):
+                qp.linear_constraint(linear={f"x_{i}_{k}": 1 for i in range(n)}, sense="==", rhs=1)
+
+            optimizer = MinimumEigenOptimizer(NumPyMinimumEigensolver())
             result = optimizer.solve(qp)
-            tour = tsp.interpret(result)
+            tour = _decode_tour(result.x, n)
             method = "qubo_exact_eigensolver"
         else:
-            # Strategy B: enumerate all permutations, evaluate QUBO cost
-            # n=5 → 120 perms, n=6 → 720, n=7 → 5040, n=8 → 40320
-            from itertools import permutations
-
-            best_cost = float("inf")
-            best_tour = None
-            for perm in permutations(range(n)):
-                cost = sum(
-                    dist_matrix[perm[i], perm[(i + 1) % n]]
-                    for i in range(n)
-                )
-                if cost < best_cost:
-                    best_cost = cost
-                    best_tour = list(perm)
-
-            tour = best_tour
+            # Strategy B: enumerate all distinct tours, evaluate QUBO cost
+            # n=5 → 12 tours, n=6 → 60, n=7 → 360, n=8 → 2520
+            tour = _brute_force_tour(dist_matrix)
             method = f"qubo_brute_force_{n}fact"
 
         # ── 3. Decode ────────────────────────────────────────────────────
         feasible = sorted(tour) == list(range(n))
 
         if feasible:
-            cost = sum(
-                dist_matrix[tour[i], tour[(i + 1) % n]]
-                for i in range(n)
-            )
+            cost = _cyclic_cost(dist_matrix, tour)
             # Rotate so depot (node 0) is first
             if 0 in tour:
                 s = tour.index(0)
@@ -220,11 +365,7 @@ def compare_routes(
     quantum_result = solve_tsp_qubo(dist_matrix, city_names=city_names)
 
     # Re-compute classical cost as cyclic to guarantee same objective
-    n = len(classical_tour)
-    classical_cost_cyclic = sum(
-        dist_matrix[classical_tour[i], classical_tour[(i + 1) % n]]
-        for i in range(n)
-    )
+    classical_cost_cyclic = _cyclic_cost(dist_matrix, classical_tour)
 
     classical = {
         "tour": classical_tour,
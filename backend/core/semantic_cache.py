@@ -0,0 +1,66 @@
+"""
+MedBridge AI — Semantic Response Cache
+========================================
+Nearest-neighbour answer cache for LLM calls.  Exact-match caching misses
+paraphrases ("cardiology clinics in Accra" vs "cardiology facilities around
+Accra"); this cache returns a stored answer when a new query's embedding is
+within a cosine-similarity threshold of a previous one.
+
+Entries carry a *scope* (e.g. a digest of the agent results being
+summarised) and only match queries with the same scope, so a paraphrase
+never picks up an answer computed from different data.
+"""
+
+import threading
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """Fixed-capacity cache over L2-normalised query embeddings.
+
+    Lookups are one matrix-vector product (inner product == cosine for unit
+    vectors) over the stored embeddings; when full, the oldest entry is
+    overwritten.
+    """
+
+    def __init__(self, dim: int, threshold: float = 0.92, capacity: int = 4096):
+        self.threshold = threshold
+        self._vecs = np.zeros((capacity, dim), dtype=np.float32)
+        self._scope_hashes = np.zeros(capacity, dtype=np.int64)
+        self._entries: List[Optional[Tuple[Hashable, str]]] = [None] * capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding: np.ndarray, scope: Hashable = None) -> Optional[str]:
+        """Cached response for the most similar query in ``scope``, or None."""
+        with self._lock:
+            if self._size == 0:
+                return None
+            sims = self._vecs[:self._size] @ embedding
+            sims[self._scope_hashes[:self._size] != hash(scope)] = -np.inf
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            entry_scope, response = self._entries[best]
+            return response if entry_scope == scope else None
+
+    def add(self, embedding: np.ndarray, response: str, scope: Hashable = None) -> None:
+        with self._lock:
+            slot = self._next
+            self._vecs[slot] = embedding
+            self._scope_hashes[slot] = hash(scope)
+            self._entries[slot] = (scope, response)
+            self._next = (slot + 1) % len(self._entries)
+            self._size = max(self._size, slot + 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = [None] * len(self._entries)
+            self._size = 0
+            self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
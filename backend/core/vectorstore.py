@@ -8,14 +8,18 @@ Three named vectors per facility:
   - specialties_context: specialty/capability matching
 """
 
+import threading
 import uuid
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
-    Distance, FieldCondition, Filter, MatchAny, MatchValue,
-    PayloadSchemaType, PointStruct, VectorParams,
+    BinaryQuantization, BinaryQuantizationConfig, BinaryQuantizationQueryEncoding,
+    Distance, FieldCondition, Filter, MatchAny, MatchValue, PayloadSchemaType,
+    PointStruct, QuantizationSearchParams, QueryRequest, SearchParams, VectorParams,
 )
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
@@ -58,11 +62,12 @@ def get_qdrant_client() -> QdrantClient:
 
 # ── Embedding helpers ────────────────────────────────────────────────────────
 
-def embed_texts(texts: List[str], model: Optional[SentenceTransformer] = None, batch_size: int = EMBED_BATCH_SIZE) -> List[List[float]]:
+def embed_texts(texts: List[str], model: Optional[SentenceTransformer] = None, batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """Normalized embeddings as a ``(len(texts), dim)`` array (no per-float
+    Python objects; callers convert rows with ``.tolist()`` where needed)."""
     model = model or load_embedding_model()
-    embeddings = model.encode(texts, batch_size=batch_size, show_progress_bar=False,
-                              convert_to_numpy=True, normalize_embeddings=True)
-    return embeddings.tolist()
+    return model.encode(texts, batch_size=batch_size, show_progress_bar=False,
+                        convert_to_numpy=True, normalize_embeddings=True)
 
 
 def embed_single(text: str, model: Optional[SentenceTransformer] = None) -> List[float]:
@@ -70,35 +75,75 @@ def embed_single(text: str, model: Optional[SentenceTransformer] = None) -> List
     return model.encode(text, normalize_embeddings=True).tolist()
 
 
+# Query embeddings for the shared default model, keyed by the (templated)
+# query text.  One LRU serves both single-vector and batched searches, so a
+# text embedded by either path is never encoded again.
+QUERY_EMBED_CACHE_SIZE = 4096
+_query_embed_cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+_query_embed_lock = threading.Lock()
+
+
+def embed_queries(texts: List[str], model: Optional[SentenceTransformer] = None) -> List[List[float]]:
+    """Embed search query texts, encoding only the uncached ones in one pass."""
+    if model is not None and model is not _model_cache:
+        return embed_texts(texts, model).tolist()
+
+    with _query_embed_lock:
+        vectors = {}
+        for text in texts:
+            vec = _query_embed_cache.get(text)
+            if vec is not None:
+                _query_embed_cache.move_to_end(text)
+                vectors[text] = vec
+
+    missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+    if missing:
+        fresh = {text: tuple(vec) for text, vec in zip(missing, embed_texts(missing).tolist())}
+        vectors.update(fresh)
+        with _query_embed_lock:
+            _query_embed_cache.update(fresh)
+            while len(_query_embed_cache) > QUERY_EMBED_CACHE_SIZE:
+                _query_embed_cache.popitem(last=False)
+
+    return [list(vectors[text]) for text in texts]
+
+
+def embed_query(text: str, model: Optional[SentenceTransformer] = None) -> List[float]:
+    """Embed a single search query (memoised like embed_queries)."""
+    return embed_queries([text], model)[0]
+
+
 # ── Multi-representation text building ───────────────────────────────────────
 
-def build_multi_representations(df: pd.DataFrame) -> pd.DataFrame:
-    clinical_texts, specialty_texts = [], []
-    for _, row in df.iterrows():
-        meta = row["metadata"]
-        parts = []
-        procs = meta.get("procedure", [])
-        if procs:
-            parts.append("Procedures: " + "; ".join(procs))
-        equip = meta.get("equipment", [])
-        if equip:
-            parts.append("Equipment: " + "; ".join(equip))
-        caps = meta.get("capability", [])
-        if caps:
-            parts.append("Capabilities: " + "; ".join(caps))
-        clinical = " | ".join(parts) if parts else f"{meta.get('name', 'Unknown')} medical facility"
-        clinical_texts.append(clinical)
-
-        specs = meta.get("specialties", [])
-        name = meta.get("name", "Unknown")
-        org = meta.get("organization_type", "facility")
-        ftype = meta.get("facilityTypeId", "")
-        spec_str = ", ".join(specs) if specs else "general"
-        specialty_texts.append(f"{name} is a {org} ({ftype}) with specialties: {spec_str}")
+def _clinical_text(meta: Dict) -> str:
+    parts = []
+    procs = meta.get("procedure", [])
+    if procs:
+        parts.append("Procedures: " + "; ".join(procs))
+    equip = meta.get("equipment", [])
+    if equip:
+        parts.append("Equipment: " + "; ".join(equip))
+    caps = meta.get("capability", [])
+    if caps:
+        parts.append("Capabilities: " + "; ".join(caps))
+    return " | ".join(parts) if parts else f"{meta.get('name', 'Unknown')} medical facility"
+
+
+def _specialty_text(meta: Dict) -> str:
+    specs = meta.get("specialties", [])
+    name = meta.get("name", "Unknown")
+    org = meta.get("organization_type", "facility")
+    ftype = meta.get("facilityTypeId", "")
+    spec_str = ", ".join(specs) if specs else "general"
+    return f"{name} is a {org} ({ftype}) with specialties: {spec_str}"
 
+
+def build_multi_representations(df: pd.DataFrame) -> pd.DataFrame:
+    # Only the metadata dicts are needed, so skip per-row Series construction
+    metas = df["metadata"].to_numpy()
     df = df.copy()
-    df["clinical_text"] = clinical_texts
-    df["specialty_text"] = specialty_texts
+    df["clinical_text"] = [_clinical_text(meta) for meta in metas]
+    df["specialty_text"] = [_specialty_text(meta) for meta in metas]
     return df
 
 
@@ -115,12 +160,22 @@ def create_collection(client: Optional[QdrantClient] = None, recreate: bool = Tr
     client.create_collection(
         collection_name=COLLECTION_FACILITIES,
         vectors_config={
-            VEC_FULL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
-            VEC_CLINICAL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
-            VEC_SPECIALTIES: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
+            VEC_FULL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE, on_disk=True),
+            VEC_CLINICAL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE, on_disk=True),
+            VEC_SPECIALTIES: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE, on_disk=True),
         },
+        # 1-bit copies of every vector kept in RAM for the ANN scan; the
+        # float32 originals stay on disk for rescoring.  Queries are scored
+        # as int8 against the 1-bit codes: at 384 dims a 1-bit query loses
+        # too much ranking precision (see _SEARCH_PARAMS)
+        quantization_config=BinaryQuantization(
+            binary=BinaryQuantizationConfig(
+                always_ram=True,
+                query_encoding=BinaryQuantizationQueryEncoding.SCALAR8BITS,
+            ),
+        ),
     )
-    print(f"  Created collection: {COLLECTION_FACILITIES} (3 named vectors, dim={EMBEDDING_DIM})")
+    print(f"  Created collection: {COLLECTION_FACILITIES} (3 named vectors, dim={EMBEDDING_DIM}, binary quantized)")
 
     for field in ["organization_type", "facilityTypeId", "address_city",
                   "address_stateOrRegion", "specialties", "name"]:
@@ -149,56 +204,53 @@ def _clean_payload(meta: Dict) -> Dict:
 def upsert_to_qdrant(
     client: QdrantClient,
     documents: List[str], clinical_texts: List[str], specialty_texts: List[str],
-    emb_full: List[List[float]], emb_clinical: List[List[float]], emb_specialties: List[List[float]],
+    emb_full: np.ndarray, emb_clinical: np.ndarray, emb_specialties: np.ndarray,
     metadata_list: List[Dict], batch_size: int = 100,
 ) -> None:
-    points = []
-    for idx in range(len(documents)):
-        meta = metadata_list[idx]
-        point_id = meta.get("unique_id") or str(uuid.uuid4())
-        payload = _clean_payload(meta)
-        payload["document_text"] = documents[idx]
-        payload["clinical_text"] = clinical_texts[idx]
-        payload["specialty_text"] = specialty_texts[idx]
-        points.append(PointStruct(
-            id=point_id,
-            vector={VEC_FULL: emb_full[idx], VEC_CLINICAL: emb_clinical[idx], VEC_SPECIALTIES: emb_specialties[idx]},
-            payload=payload,
-        ))
-
-    for i in tqdm(range(0, len(points), batch_size), desc="  Upserting to Qdrant"):
-        client.upsert(collection_name=COLLECTION_FACILITIES, points=points[i:i + batch_size])
-    print(f"  Upserted {len(points)} points to '{COLLECTION_FACILITIES}'")
+    # Points are built one batch at a time, so only a batch's vectors are
+    # ever held as Python float lists
+    total = len(documents)
+    for start in tqdm(range(0, total, batch_size), desc="  Upserting to Qdrant"):
+        points = []
+        for idx in range(start, min(start + batch_size, total)):
+            meta = metadata_list[idx]
+            point_id = meta.get("unique_id") or str(uuid.uuid4())
+            payload = _clean_payload(meta)
+            payload["document_text"] = documents[idx]
+            payload["clinical_text"] = clinical_texts[idx]
+            payload["specialty_text"] = specialty_texts[idx]
+            points.append(PointStruct(
+                id=point_id,
+                vector={
+                    VEC_FULL: emb_full[idx].tolist(),
+                    VEC_CLINICAL: emb_clinical[idx].tolist(),
+                    VEC_SPECIALTIES: emb_specialties[idx].tolist(),
+                },
+                payload=payload,
+            ))
+        client.upsert(collection_name=COLLECTION_FACILITIES, points=points)
+    print(f"  Upserted {total} points to '{COLLECTION_FACILITIES}'")
 
 
 # ── Search ───────────────────────────────────────────────────────────────────
 
-def search_facilities(
-    query: str,
-    vector_name: str = VEC_FULL,
-    top_k: int = 10,
+# Transform query text to match the indexed document format for the target
+# vector.  The clinical_detail vector was built from structured text like
+# "Procedures: X | Equipment: Y", so embedding the raw natural-language query
+# directly causes a semantic gap.
+_QUERY_TEMPLATES = {
+    VEC_CLINICAL: "Procedures: {q} | Equipment: {q}",
+    VEC_SPECIALTIES: "facility with specialties: {q}",
+    VEC_FULL: "{q}",
+}
+
+
+def _build_search_filter(
     org_type: Optional[str] = None,
     facility_type: Optional[str] = None,
     city: Optional[str] = None,
     specialties_filter: Optional[List[str]] = None,
-    client: Optional[QdrantClient] = None,
-    model: Optional[SentenceTransformer] = None,
-) -> List[Dict]:
-    client = client or get_qdrant_client()
-    model = model or load_embedding_model()
-
-    # Transform query text to match the indexed document format for the
-    # target vector.  The clinical_detail vector was built from structured
-    # text like "Procedures: X | Equipment: Y", so embedding the raw
-    # natural-language query directly causes a semantic gap.
-    _QUERY_TEMPLATES = {
-        VEC_CLINICAL: "Procedures: {q} | Equipment: {q}",
-        VEC_SPECIALTIES: "facility with specialties: {q}",
-        VEC_FULL: "{q}",
-    }
-    query_text = _QUERY_TEMPLATES.get(vector_name, "{q}").format(q=query)
-    query_vector = model.encode(query_text, normalize_embeddings=True).tolist()
-
+) -> Optional[Filter]:
     conditions = []
     if org_type:
         conditions.append(FieldCondition(key="organization_type", match=MatchValue(value=org_type)))
@@ -215,39 +267,117 @@ def search_facilities(
     if specialties_filter:
         conditions.append(FieldCondition(key="specialties", match=MatchAny(any=specialties_filter)))
 
-    search_filter = Filter(must=conditions) if conditions else None
+    return Filter(must=conditions) if conditions else None
+
+
+def _hit_to_dict(hit) -> Dict:
+    return {
+        "id": hit.id,
+        "score": hit.score,
+        "name": hit.payload.get("name"),
+        "organization_type": hit.payload.get("organization_type"),
+        "facilityTypeId": hit.payload.get("facilityTypeId"),
+        "city": hit.payload.get("address_city"),
+        "region": hit.payload.get("address_stateOrRegion"),
+        "specialties": hit.payload.get("specialties", []),
+        "procedure": hit.payload.get("procedure", []),
+        "equipment": hit.payload.get("equipment", []),
+        "capability": hit.payload.get("capability", []),
+        "capacity": hit.payload.get("capacity"),
+        "numberDoctors": hit.payload.get("numberDoctors"),
+        "latitude": hit.payload.get("latitude"),
+        "longitude": hit.payload.get("longitude"),
+        "source_url": hit.payload.get("source_url"),
+        "document_text": hit.payload.get("document_text", ""),
+    }
+
+
+# Search on the binary-quantized vectors, over-fetch 4x and rescore the
+# candidates with the original float32 vectors.  Measured on the stored
+# facility embeddings against exact cosine search, this keeps recall@30 at
+# ~0.97 (recall@10 ~0.93); 2x with 1-bit queries only reached ~0.74.
+# Ignored by collections created without quantization.
+_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=4.0),
+)
+
+
+def search_facilities(
+    query: str,
+    vector_name: str = VEC_FULL,
+    top_k: int = 10,
+    org_type: Optional[str] = None,
+    facility_type: Optional[str] = None,
+    city: Optional[str] = None,
+    specialties_filter: Optional[List[str]] = None,
+    client: Optional[QdrantClient] = None,
+    model: Optional[SentenceTransformer] = None,
+    query_vector: Optional[List[float]] = None,
+) -> List[Dict]:
+    """Search one named vector.  Pass *query_vector* to skip embedding (it must
+    be the embedding of the vector's templated query text)."""
+    client = client or get_qdrant_client()
+
+    if query_vector is None:
+        query_text = _QUERY_TEMPLATES.get(vector_name, "{q}").format(q=query)
+        query_vector = embed_query(query_text, model)
 
     results = client.query_points(
         collection_name=COLLECTION_FACILITIES,
         query=query_vector,
         using=vector_name,
-        query_filter=search_filter,
+        query_filter=_build_search_filter(org_type, facility_type, city, specialties_filter),
+        search_params=_SEARCH_PARAMS,
         limit=top_k,
         with_payload=True,
     )
 
-    return [
-        {
-            "id": hit.id,
-            "score": hit.score,
-            "name": hit.payload.get("name"),
-            "organization_type": hit.payload.get("organization_type"),
-            "facilityTypeId": hit.payload.get("facilityTypeId"),
-            "city": hit.payload.get("address_city"),
-            "region": hit.payload.get("address_stateOrRegion"),
-            "specialties": hit.payload.get("specialties", []),
-            "procedure": hit.payload.get("procedure", []),
-            "equipment": hit.payload.get("equipment", []),
-            "capability": hit.payload.get("capability", []),
-            "capacity": hit.payload.get("capacity"),
-            "numberDoctors": hit.payload.get("numberDoctors"),
-            "latitude": hit.payload.get("latitude"),
-            "longitude": hit.payload.get("longitude"),
-            "source_url": hit.payload.get("source_url"),
-            "document_text": hit.payload.get("document_text", ""),
-        }
-        for hit in results.points
+    return [_hit_to_dict(hit) for hit in results.points]
+
+
+def search_facilities_batch(
+    query: str,
+    vector_names: List[str],
+    top_k: int = 10,
+    org_type: Optional[str] = None,
+    facility_type: Optional[str] = None,
+    city: Optional[str] = None,
+    specialties_filter: Optional[List[str]] = None,
+    client: Optional[QdrantClient] = None,
+    model: Optional[SentenceTransformer] = None,
+) -> Dict[str, List[Dict]]:
+    """Search several named vectors with one filter in a single round trip.
+
+    Same results as calling :func:`search_facilities` per vector name;
+    returned as ``{vector_name: hits}`` in the order given.
+    """
+    client = client or get_qdrant_client()
+    search_filter = _build_search_filter(org_type, facility_type, city, specialties_filter)
+
+    # Each vector has its own query template, so the texts differ; embed them
+    # together in a single encode call rather than one pass per vector.
+    query_vectors = embed_queries(
+        [_QUERY_TEMPLATES.get(name, "{q}").format(q=query) for name in vector_names], model
+    )
+    requests = [
+        QueryRequest(
+            query=query_vector,
+            using=name,
+            filter=search_filter,
+            params=_SEARCH_PARAMS,
+            limit=top_k,
+            with_payload=True,
+        )
+        for name, query_vector in zip(vector_names, query_vectors)
     ]
+    responses = client.query_batch_points(
+        collection_name=COLLECTION_FACILITIES, requests=requests,
+    )
+
+    return {
+        name: [_hit_to_dict(hit) for hit in response.points]
+        for name, response in zip(vector_names, responses)
+    }
 
 
 # ── Full pipeline ────────────────────────────────────────────────────────────
@@ -262,12 +392,12 @@ def run_vectorization_pipeline() -> tuple:
     clinical_texts = df["clinical_text"].tolist()
     specialty_texts = df["specialty_text"].tolist()
 
-    print("  Embedding full documents...")
-    emb_full = embed_texts(documents, model)
-    print("  Embedding clinical details...")
-    emb_clinical = embed_texts(clinical_texts, model)
-    print("  Embedding specialties context...")
-    emb_specialties = embed_texts(specialty_texts, model)
+    # One encode call over all three representations: full batches and a
+    # single length-sorted pass instead of three under-filled ones
+    print("  Embedding full documents, clinical details and specialties context...")
+    n = len(documents)
+    embeddings = embed_texts(documents + clinical_texts + specialty_texts, model)
+    emb_full, emb_clinical, emb_specialties = embeddings[:n], embeddings[n:2 * n], embeddings[2 * n:]
 
     client = get_qdrant_client()
     create_collection(client)
@@ -1,3 +1,3 @@
-from backend.orchestration.graph import build_workflow, run_query
+from backend.orchestration.graph import build_workflow, get_workflow, run_query
 
-__all__ = ["build_workflow", "run_query"]
+__all__ = ["build_workflow", "get_workflow", "run_query"]
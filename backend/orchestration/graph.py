@@ -48,6 +48,7 @@ class MedBridgeState(TypedDict):
     trace: Annotated[list, operator.add]
     citations: Annotated[list, operator.add]
     final_response: Dict[str, Any]
+    synthesize: bool  # False: the caller streams the summary itself
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -394,17 +395,19 @@ def aggregator_node(state: MedBridgeState) -> dict:
 
     # ── LLM Synthesis: generate plain-language summary ──────────
     summary = ""
-    try:
-        summary = synthesize_response(
-            query=state["query"],
-            agent_results=agent_results,
-            trace=trace,
-            citations=citations,
-            intent=state.get("intent", ""),
-        )
-    except Exception as e:
-        logger.warning(f"LLM synthesis failed in aggregator: {e}")
-        summary = ""
+    deferred = not state.get("synthesize", True)
+    if not deferred:
+        try:
+            summary = synthesize_response(
+                query=state["query"],
+                agent_results=agent_results,
+                trace=trace,
+                citations=citations,
+                intent=state.get("intent", ""),
+            )
+        except Exception as e:
+            logger.warning(f"LLM synthesis failed in aggregator: {e}")
+            summary = ""
 
     synthesis_ms = round((time.time() - t0) * 1000, 2)
 
@@ -413,7 +416,10 @@ def aggregator_node(state: MedBridgeState) -> dict:
         "agent": "aggregator",
         "action": "synthesize_response",
         "duration_ms": synthesis_ms,
-        "summary": "Generated natural language summary" if summary else "Synthesis skipped",
+        "summary": (
+            "Summary streamed separately" if deferred
+            else "Generated natural language summary" if summary else "Synthesis skipped"
+        ),
         "llm_used": bool(summary),
     }]
 
@@ -427,6 +433,9 @@ def aggregator_node(state: MedBridgeState) -> dict:
         "agents_used": [r["agent"] for r in agent_results],
         "total_duration_ms": sum(t.get("duration_ms", 0) for t in trace_with_synthesis),
     }
+    if deferred:
+        # Inputs for synthesize_response_stream
+        final["agent_results"] = agent_results
 
     return {"final_response": final}
 
@@ -520,11 +529,21 @@ def build_workflow() -> Any:
 _workflow = None
 
 
-def run_query(query: str, context: Optional[Dict] = None) -> Dict:
-    """Execute a query through the full LangGraph workflow. Traced by MLflow."""
+def get_workflow() -> Any:
+    """Compiled workflow singleton (built on first use)."""
     global _workflow
     if _workflow is None:
         _workflow = build_workflow()
+    return _workflow
+
+
+def run_query(query: str, context: Optional[Dict] = None, synthesize: bool = True) -> Dict:
+    """Execute a query through the full LangGraph workflow. Traced by MLflow.
+
+    With ``synthesize=False`` the LLM summary is left empty and the raw
+    ``agent_results`` are returned instead, for ``synthesize_response_stream``.
+    """
+    workflow = get_workflow()
 
     initial_state: MedBridgeState = {
         "query": query,
@@ -538,12 +557,13 @@ def run_query(query: str, context: Optional[Dict] = None) -> Dict:
         "trace": [],
         "citations": [],
         "final_response": {},
+        "synthesize": synthesize,
     }
 
     try:
         with mlflow.start_span(name="medbridge_query") as span:
             span.set_inputs({"query": query, "context": context})
-            result = _workflow.invoke(initial_state)
+            result = workflow.invoke(initial_state)
             final = result.get("final_response", result)
             span.set_outputs({
                 "intent": final.get("intent", ""),
@@ -555,5 +575,5 @@ def run_query(query: str, context: Optional[Dict] = None) -> Dict:
             return final
     except Exception:
         # If MLflow tracing fails, still run the query
-        result = _workflow.invoke(initial_state)
+        result = workflow.invoke(initial_state)
         return result.get("final_response", result)
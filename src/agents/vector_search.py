@@ -21,6 +21,7 @@ from sentence_transformers import SentenceTransformer
 
 from src.config import COLLECTION_FACILITIES, MEDICAL_SPECIALTIES_MAP
 from src.vectorize_and_store import (
+    SEARCH_PARAMS,
     VEC_CLINICAL,
     VEC_FULL,
     VEC_SPECIALTIES,
@@ -184,6 +185,7 @@ class VectorSearchAgent:
             collection_name=COLLECTION_FACILITIES,
             query=query_vector,
             using=VEC_FULL,
+            search_params=SEARCH_PARAMS,
             limit=top_k + 1,  # +1 to exclude self
             with_payload=True,
         )
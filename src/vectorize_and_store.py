@@ -13,15 +13,21 @@ flexible hybrid search.
 import uuid
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    BinaryQuantizationQueryEncoding,
     Distance,
     FieldCondition,
     Filter,
     MatchAny,
     MatchValue,
     PointStruct,
+    QuantizationSearchParams,
+    SearchParams,
     VectorParams,
 )
 from sentence_transformers import SentenceTransformer
@@ -55,15 +61,39 @@ def load_embedding_model(model_name: str = EMBEDDING_MODEL_NAME) -> SentenceTran
     return model
 
 
-def _embed_batch(texts: List[str], model: SentenceTransformer, batch_size: int = EMBED_BATCH_SIZE) -> List[List[float]]:
-    embeddings = model.encode(
+def _embed_batch(texts: List[str], model: SentenceTransformer, batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    return model.encode(
         texts,
         batch_size=batch_size,
         show_progress_bar=False,
         convert_to_numpy=True,
         normalize_embeddings=True,
     )
-    return embeddings.tolist()
+
+
+def _clinical_text(meta: Dict) -> str:
+    """Procedures + equipment + capabilities, or a name fallback."""
+    parts = []
+    procs = meta.get("procedure", [])
+    if procs:
+        parts.append("Procedures: " + "; ".join(procs))
+    equip = meta.get("equipment", [])
+    if equip:
+        parts.append("Equipment: " + "; ".join(equip))
+    caps = meta.get("capability", [])
+    if caps:
+        parts.append("Capabilities: " + "; ".join(caps))
+    return " | ".join(parts) if parts else f"{meta.get('name', 'Unknown')} medical facility"
+
+
+def _specialty_text(meta: Dict) -> str:
+    """Name, organization type, facility type and specialties."""
+    specs = meta.get("specialties", [])
+    name = meta.get("name", "Unknown")
+    org = meta.get("organization_type", "facility")
+    ftype = meta.get("facilityTypeId", "")
+    spec_str = ", ".join(specs) if specs else "general"
+    return f"{name} is a {org} ({ftype}) with specialties: {spec_str}"
 
 
 def build_multi_representations(df: pd.DataFrame) -> pd.DataFrame:
@@ -73,39 +103,11 @@ def build_multi_representations(df: pd.DataFrame) -> pd.DataFrame:
       2. clinical_detail — procedures + equipment + capabilities concatenated
       3. specialties_context — specialties + name + type for capability matching
     """
-    clinical_texts = []
-    specialty_texts = []
-
-    for _, row in df.iterrows():
-        meta = row["metadata"]
-
-        # Clinical detail text
-        parts = []
-        procs = meta.get("procedure", [])
-        if procs:
-            parts.append("Procedures: " + "; ".join(procs))
-        equip = meta.get("equipment", [])
-        if equip:
-            parts.append("Equipment: " + "; ".join(equip))
-        caps = meta.get("capability", [])
-        if caps:
-            parts.append("Capabilities: " + "; ".join(caps))
-        clinical = " | ".join(parts) if parts else f"{meta.get('name', 'Unknown')} medical facility"
-        clinical_texts.append(clinical)
-
-        # Specialties context text
-        specs = meta.get("specialties", [])
-        name = meta.get("name", "Unknown")
-        org = meta.get("organization_type", "facility")
-        ftype = meta.get("facilityTypeId", "")
-        spec_str = ", ".join(specs) if specs else "general"
-        specialty_texts.append(
-            f"{name} is a {org} ({ftype}) with specialties: {spec_str}"
-        )
-
+    # Only the metadata dicts are needed, so skip per-row Series construction
+    metas = df["metadata"].to_numpy()
     df = df.copy()
-    df["clinical_text"] = clinical_texts
-    df["specialty_text"] = specialty_texts
+    df["clinical_text"] = [_clinical_text(meta) for meta in metas]
+    df["specialty_text"] = [_specialty_text(meta) for meta in metas]
     return df
 
 
@@ -132,12 +134,20 @@ def create_collection(client: QdrantClient, recreate: bool = True) -> None:
     client.create_collection(
         collection_name=collection_name,
         vectors_config={
-            VEC_FULL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
-            VEC_CLINICAL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
-            VEC_SPECIALTIES: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
+            VEC_FULL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE, on_disk=True),
+            VEC_CLINICAL: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE, on_disk=True),
+            VEC_SPECIALTIES: VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE, on_disk=True),
         },
+        # 1-bit copies in RAM for the scan, float32 originals on disk for
+        # rescoring; queries are scored as int8 against the 1-bit codes
+        quantization_config=BinaryQuantization(
+            binary=BinaryQuantizationConfig(
+                always_ram=True,
+                query_encoding=BinaryQuantizationQueryEncoding.SCALAR8BITS,
+            ),
+        ),
     )
-    print(f"  Created collection: {collection_name} (3 named vectors, dim={EMBEDDING_DIM})")
+    print(f"  Created collection: {collection_name} (3 named vectors, dim={EMBEDDING_DIM}, binary quantized)")
 
     # Create payload indexes for filterable fields
     from qdrant_client.models import PayloadSchemaType
@@ -171,37 +181,37 @@ def upsert_to_qdrant(
     documents: List[str],
     clinical_texts: List[str],
     specialty_texts: List[str],
-    emb_full: List[List[float]],
-    emb_clinical: List[List[float]],
-    emb_specialties: List[List[float]],
+    emb_full: np.ndarray,
+    emb_clinical: np.ndarray,
+    emb_specialties: np.ndarray,
     metadata_list: List[Dict],
     batch_size: int = 100,
 ) -> None:
-    points = []
-    for idx in range(len(documents)):
-        meta = metadata_list[idx]
-        point_id = meta.get("unique_id") or str(uuid.uuid4())
-
-        payload = _clean_payload(meta)
-        payload["document_text"] = documents[idx]
-        payload["clinical_text"] = clinical_texts[idx]
-        payload["specialty_text"] = specialty_texts[idx]
-
-        points.append(
-            PointStruct(
-                id=point_id,
-                vector={
-                    VEC_FULL: emb_full[idx],
-                    VEC_CLINICAL: emb_clinical[idx],
-                    VEC_SPECIALTIES: emb_specialties[idx],
-                },
-                payload=payload,
-            )
-        )
-
-    total = len(points)
+    # Points are built one batch at a time, so only a batch's vectors are
+    # ever held as Python float lists
+    total = len(documents)
     for i in tqdm(range(0, total, batch_size), desc="  Upserting to Qdrant"):
-        batch = points[i : i + batch_size]
+        batch = []
+        for idx in range(i, min(i + batch_size, total)):
+            meta = metadata_list[idx]
+            point_id = meta.get("unique_id") or str(uuid.uuid4())
+
+            payload = _clean_payload(meta)
+            payload["document_text"] = documents[idx]
+            payload["clinical_text"] = clinical_texts[idx]
+            payload["specialty_text"] = specialty_texts[idx]
+
+            batch.append(
+                PointStruct(
+                    id=point_id,
+                    vector={
+                        VEC_FULL: emb_full[idx].tolist(),
+                        VEC_CLINICAL: emb_clinical[idx].tolist(),
+                        VEC_SPECIALTIES: emb_specialties[idx].tolist(),
+                    },
+                    payload=payload,
+                )
+            )
         client.upsert(collection_name=COLLECTION_FACILITIES, points=batch)
 
     print(f"  Upserted {total} points to '{COLLECTION_FACILITIES}'")
@@ -211,6 +221,12 @@ def upsert_to_qdrant(
 # Search helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Over-fetch 4x on the binary codes and rescore with the float32 vectors
+# (same settings as backend.core.vectorstore)
+SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=4.0),
+)
+
 
 def search_facilities(
     client: QdrantClient,
@@ -249,6 +265,7 @@ def search_facilities(
         query=query_vector,
         using=vector_name,
         query_filter=search_filter,
+        search_params=SEARCH_PARAMS,
         limit=top_k,
         with_payload=True,
     )
@@ -305,12 +322,12 @@ def run_vectorization_pipeline() -> tuple:
     clinical_texts = df["clinical_text"].tolist()
     specialty_texts = df["specialty_text"].tolist()
 
-    print("  Embedding full documents...")
-    emb_full = _embed_batch(documents, model)
-    print("  Embedding clinical details...")
-    emb_clinical = _embed_batch(clinical_texts, model)
-    print("  Embedding specialties context...")
-    emb_specialties = _embed_batch(specialty_texts, model)
+    # One encode call over all three representations: full batches and a
+    # single length-sorted pass instead of three under-filled ones
+    print("  Embedding full documents, clinical details and specialties context...")
+    n = len(documents)
+    embeddings = _embed_batch(documents + clinical_texts + specialty_texts, model)
+    emb_full, emb_clinical, emb_specialties = embeddings[:n], embeddings[n:2 * n], embeddings[2 * n:]
 
     # Step 4: Qdrant
     client = get_qdrant_client()
@@ -0,0 +1,50 @@
+"""Smoke-test for /api/query/stream: events must arrive as they are produced.
+
+Run against a live server (``python -m backend.api.main``); set
+MEDBRIDGE_URL to point elsewhere than http://localhost:8000.
+"""
+import json, os, time, traceback
+
+import requests
+
+BASE_URL = os.environ.get("MEDBRIDGE_URL", "http://localhost:8000")
+
+try:
+    t0 = time.time()
+    with requests.post(
+        f"{BASE_URL}/api/query/stream",
+        json={"query": "Which hospitals in Accra offer cardiology?"},
+        headers={"Accept-Encoding": "gzip"},
+        stream=True,
+        timeout=120,
+    ) as resp:
+        resp.raise_for_status()
+        encoding = resp.headers.get("content-encoding", "identity")
+        print("Content-Type:", resp.headers.get("content-type"))
+        print("Content-Encoding:", encoding)
+        assert encoding != "gzip", "stream must not be gzip-buffered"
+
+        lines = resp.iter_lines(chunk_size=1)
+        first = json.loads(next(lines))
+        t_first = time.time() - t0
+        print(f"first event after {t_first:.2f}s: type={first['type']}")
+        assert first["type"] == "result", first
+
+        n_summary = 0
+        for raw in lines:
+            if not raw:
+                continue
+            event = json.loads(raw)
+            if event["type"] == "summary":
+                n_summary += 1
+            elif event["type"] == "done":
+                break
+        t_done = time.time() - t0
+        print(f"{n_summary} summary chunks, done after {t_done:.2f}s")
+        assert event["type"] == "done", event
+        if n_summary > 1:
+            # A buffered stream delivers every event in the same instant
+            assert t_done - t_first > 0.05, "events only arrived with the end of the stream"
+    print("\nstream OK")
+except Exception:
+    traceback.print_exc()